@@ -5,7 +5,6 @@ App
 
 import asyncio
 
-import sentry_sdk
 import uvloop
 from aiohttp import web
 from aiohttp_apispec import setup_aiohttp_apispec
@@ -21,6 +20,8 @@ from server.service.manager.bike_connection_manager import BikeConnectionManager
 from server.service.manager.rental_manager import RentalManager
 from server.service.manager.reservation_manager import ReservationManager
 from server.service.payment import PaymentManager, DummyPaymentManager
+from server.service.pickup_cache import PickupPointCache
+from server.service.ticket_store import TicketStore
 from server.service.verify_token import FirebaseVerifier, DummyVerifier
 from server.signals import register_signals
 from server.version import __version__, name
@@ -53,6 +54,8 @@ def build_app(db_uri=None):
     app['reservation_manager'] = ReservationManager(app['bike_location_manager'], app['rental_manager'])
     app['reservation_sourcer'] = ReservationSourcer(app['reservation_manager'])
     app['statistics_reporter'] = StatisticsReporter(app['rental_manager'], app['reservation_manager'])
+    app['ticket_store'] = TicketStore()
+    app['pickup_cache'] = PickupPointCache()
     app['database_uri'] = db_uri if db_uri is not None else 'spatialite://:memory:'
     app['token_verifier'] = verifier
 
@@ -92,6 +95,8 @@ def build_app(db_uri=None):
 
     # set up sentry exception tracking
     if server_mode != "development":
+        import sentry_sdk  # only pay for the sdk import when it is used
+
         logger.info("Starting Sentry Logging")
         sentry_sdk.init(
             dsn="https://ac31a26ce42c434e9ce1bde34768631d@sentry.io/1296249",
@@ -1,3 +1,4 @@
+from asyncio import gather
 from collections import defaultdict
 from inspect import signature, iscoroutinefunction, Signature
 from typing import Type, Union, Callable, List, Dict
@@ -96,8 +97,16 @@ class AsyncEventHub(EventHub):
     async def emit(self, target: Union[Callable, EventEmitter], *args, **kwargs):
         event = self._resolve_event(target)
         super().emit(event, *args, **kwargs)
-        for handler in self._async_listeners[event]:
-            await handler(*args, **kwargs)
+
+        # run the async handlers concurrently, letting them all finish before raising the first error
+        results = await gather(
+            *(handler(*args, **kwargs) for handler in self._async_listeners[event]),
+            return_exceptions=True
+        )
+        for result in results:
+            # CancelledError is only a BaseException from 3.8, so check for those too
+            if isinstance(result, BaseException):
+                raise result
 
     def subscribe(self, target: Union[Callable, EventEmitter], handler: Callable):
         """
@@ -3,11 +3,10 @@ Middleware
 ----------
 """
 
-from aiohttp import web
 from aiohttp.abc import Request
 from aiohttp.web_middlewares import middleware
 
-from server.serializer import JSendStatus, JSendSchema
+from server.serializer import JSendStatus, JSendSchema, json_response
 from server.service.verify_token import verify_token, TokenVerificationError
 
 response_schema = JSendSchema()
@@ -24,7 +23,7 @@ async def validate_token_middleware(request: Request, handler):
         try:
             request["token"] = verify_token(request)
         except TokenVerificationError as error:
-            return web.json_response(response_schema.dump({
+            return json_response(response_schema.dump({
                 "status": JSendStatus.FAIL,
                 "data": {
                     "message": "Supplied authorization token is invalid.",
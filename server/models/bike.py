@@ -10,7 +10,8 @@ which facilitates bike location updates and remote procedure calls on all
 connected bikes.
 """
 from enum import Enum
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 
 from tortoise import Model, fields
 
@@ -43,6 +44,12 @@ class CalculatedBikeStatus(str, Enum):
             return cls.DISCONNECTED
 
 
+@lru_cache(maxsize=1024)
+def _decode_public_key(public_key_hex: str) -> bytes:
+    """Decodes a hex public key, memoized so each key is only decoded once."""
+    return bytes.fromhex(public_key_hex)
+
+
 class BikeStateUpdate(Model):
     id = fields.IntField(pk=True)
     bike = fields.ForeignKeyField("models.Bike", related_name="state_updates")
@@ -57,17 +64,21 @@ class Bike(Model):
 
     def serialize(
         self, bike_connection_manager, rental_manager,
-        reservation_manager, *, include_location=False, issues: List = None
+        reservation_manager, *, include_location=False, issues: List = None, reserved: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Serializes the bike into a format that can be turned into JSON.
 
         :param include_location: Whether to force include the location, ignoring whether it is available (PRIVACY WARNING)
         :param issues: The open issues for the given bike.
+        :param reserved: Whether the bike is reserved, if already known.
         :return: A dictionary.
         """
         connected = bike_connection_manager.is_connected(self)
-        rented = not rental_manager.is_available(self, reservation_manager)
+        if reserved is None:
+            rented = not rental_manager.is_available(self, reservation_manager)
+        else:
+            rented = reserved or rental_manager.is_in_use(self)
         available = connected and not rented
         broken = self.broken
         in_circulation = self.in_circulation
@@ -98,10 +109,30 @@ class Bike(Model):
 
         return data
 
+    @staticmethod
+    def serialize_many(
+        bikes: List["Bike"], bike_connection_manager, rental_manager,
+        reservation_manager, *, include_location=False
+    ) -> List[Dict[str, Any]]:
+        """
+        Serializes a list of bikes, checking their reservations in one pass.
+
+        :param include_location: Whether to force include the location, ignoring whether it is available (PRIVACY WARNING)
+        :return: A list of dictionaries.
+        """
+        reserved = reservation_manager.reserved_bikes(bikes)
+        return [
+            bike.serialize(
+                bike_connection_manager, rental_manager, reservation_manager,
+                include_location=include_location, reserved=bike.id in reserved
+            )
+            for bike in bikes
+        ]
+
     @property
     def public_key(self) -> bytes:
-        """The public key bytes."""
-        return bytes.fromhex(self.public_key_hex)
+        """The public key bytes, decoded once for each hex key."""
+        return _decode_public_key(self.public_key_hex)
 
     @property
     def identifier(self) -> str:
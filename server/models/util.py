@@ -22,7 +22,11 @@ class RentalUpdateType(str, Enum):
     @staticmethod
     def terminating_types():
         """The update types that result in the end of the rental."""
-        return RentalUpdateType.RETURN, RentalUpdateType.CANCEL
+        return TERMINATING_RENTAL_UPDATES
+
+
+TERMINATING_RENTAL_UPDATES = (RentalUpdateType.RETURN, RentalUpdateType.CANCEL)
+"""The update types that result in the end of the rental, built once rather than on every check."""
 
 
 def resolve_id(target: Union[Model, int]):
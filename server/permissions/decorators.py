@@ -6,11 +6,12 @@ Decorators
 from functools import wraps
 from http import HTTPStatus
 
-from aiohttp import web
 from aiohttp.web_urldispatcher import View
 
 from server.permissions.permission import RoutePermissionError, Permission
-from server.serializer import JSendSchema, JSendStatus
+from server.serializer import JSendSchema, JSendStatus, json_response
+
+response_schema = JSendSchema()
 
 
 def add_apispec_permission(original_function, new_func, permission):
@@ -40,8 +41,7 @@ def requires(permission: Permission):
             try:
                 await permission(self, **kwargs)
             except RoutePermissionError as error:
-                response_schema = JSendSchema()
-                return web.json_response(response_schema.dump({
+                return json_response(response_schema.dump({
                     "status": JSendStatus.FAIL,
                     "data": {
                         "message": f"You cannot do that because because {str(error)}.",
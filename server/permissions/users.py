@@ -3,7 +3,7 @@ from aiohttp.web_urldispatcher import View
 from server.models import User, Bike, Reservation
 from server.models.user import UserType
 from server.permissions.permission import RoutePermissionError, Permission
-from server.service.access.users import get_user
+from server.service.access.users import get_token_user
 from server.service.verify_token import verify_token, TokenVerificationError
 
 
@@ -19,7 +19,7 @@ class UserIsAdmin(Permission):
 
         if not view.request["token"] == user.firebase_id:
             # an admin is fetching a user's details; we need to get the admin's details
-            user = await get_user(firebase_id=view.request["token"])
+            user = await get_token_user(view.request)
 
         if user is None or not user.type is not UserType.USER:
             raise RoutePermissionError("The supplied token doesn't have admin rights.")
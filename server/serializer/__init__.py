@@ -17,3 +17,4 @@ from .fields import BytesField, EnumField
 from .geojson import GeoJSONType, GeoJSON, GeometryType, Geometry
 from .jsend import JSendSchema, JSendStatus
 from .json_rpc import JsonRPCRequest, JsonRPCResponse, ErrorObject
+from .response import json_response
@@ -24,8 +24,10 @@ from apispec.ext.marshmallow import OpenAPIConverter, resolver
 from marshmallow import Schema, ValidationError
 
 from server.serializer.jsend import JSendSchema, JSendStatus
+from server.serializer.response import json_response
 
 converter = OpenAPIConverter("3.0.2", resolver, None)
+response_schema = JSendSchema()
 
 
 def expects(schema: Optional[Schema], into="data"):
@@ -68,7 +70,6 @@ def expects(schema: Optional[Schema], into="data"):
 
             # if the request is not JSON or missing, return a warning and the valid schema
             if not self.request.body_exists or not self.request.content_type == "application/json":
-                response_schema = JSendSchema()
                 response_data = response_schema.dump({
                     "status": JSendStatus.FAIL,
                     "data": {
@@ -76,13 +77,12 @@ def expects(schema: Optional[Schema], into="data"):
                         "schema": json_schema
                     }
                 })
-                return web.json_response(response_data, status=HTTPStatus.BAD_REQUEST)
+                return json_response(response_data, status=HTTPStatus.BAD_REQUEST)
 
             try:
                 self.request[into] = schema.load(await self.request.json())
             except JSONDecodeError as err:
                 # if the data is not valid json, return a warning
-                response_schema = JSendSchema()
                 response_data = response_schema.dump({
                     "status": JSendStatus.FAIL,
                     "data": {
@@ -90,10 +90,9 @@ def expects(schema: Optional[Schema], into="data"):
                         "errors": err.args
                     }
                 })
-                return web.json_response(response_data, status=HTTPStatus.BAD_REQUEST)
+                return json_response(response_data, status=HTTPStatus.BAD_REQUEST)
             except ValidationError as err:
                 # if the json data does not match the schema, return the errors and the valid schema
-                response_schema = JSendSchema()
                 response_data = response_schema.dump({
                     "status": JSendStatus.FAIL,
                     "data": {
@@ -102,7 +101,7 @@ def expects(schema: Optional[Schema], into="data"):
                         "schema": json_schema
                     }
                 })
-                return web.json_response(response_data, status=HTTPStatus.BAD_REQUEST)
+                return json_response(response_data, status=HTTPStatus.BAD_REQUEST)
 
             # if everything passes, execute the original function
             return await original_function(self, **kwargs)
@@ -181,17 +180,16 @@ def returns(
             try:
                 matched_schema, matched_return_code = named_schema[schema_name]
                 if matched_schema is not None:
-                    return web.json_response(matched_schema.dump(response_data), status=matched_return_code.status_code)
+                    return json_response(matched_schema.dump(response_data), status=matched_return_code.status_code)
                 else:
                     raise matched_return_code
             except (ValidationError, KeyError) as err:
-                response_schema = JSendSchema()
                 response_data = response_schema.dump({
                     "status": JSendStatus.ERROR,
                     "data": err.messages if isinstance(err, ValidationError) else err.args,
                     "message": "We tried to send you data back, but it came out wrong."
                 })
-                return web.json_response(response_data, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+                return json_response(response_data, status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
         # Set up the apispec documentation on the new function
         if not hasattr(original_function, "__apispec__"):
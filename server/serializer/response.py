@@ -0,0 +1,24 @@
+"""
+Response
+--------
+
+Helpers for sending serialized data back to the client.
+"""
+
+import json
+from typing import Any
+
+from aiohttp import web
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+"""A shared encoder that produces compact JSON."""
+
+
+def json_response(data: Any, *, status: int = 200) -> web.Response:
+    """
+    Serializes the data into a JSON response.
+
+    Unlike :func:`aiohttp.web.json_response` the output
+    has no whitespace between the keys and values.
+    """
+    return web.Response(text=_ENCODER.encode(data), status=status, content_type="application/json")
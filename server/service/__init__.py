@@ -11,6 +11,7 @@ It is designed to represent the business logic.
 """
 
 from .manager.rental_manager import InactiveRentalError, ActiveRentalError, RentalManager
+from .pickup_cache import PickupPointCache
 from .ticket_store import TicketStore, TooManyTicketError, BikeConnectionTicket
 
 MASTER_KEY = 0xdeadbeef.to_bytes(4, "big")
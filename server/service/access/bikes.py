@@ -10,7 +10,6 @@ upon actual deployment, will be replaced with a more secure method.
 """
 from typing import Optional, Dict, Union, List
 
-from tortoise.exceptions import DoesNotExist
 from tortoise.query_utils import Prefetch
 
 from server.models import Bike, LocationUpdate, BikeStateUpdate, Issue
@@ -47,14 +46,11 @@ async def get_bike(*, identifier: Union[str, bytes] = None,
     if identifier:
         kwargs["public_key_hex__startswith"] = identifier.hex() if isinstance(identifier, bytes) else identifier
 
-    try:
-        return await Bike.get(**kwargs).first().prefetch_related(
-            Prefetch("location_updates", queryset=LocationUpdate.all().limit(100)),
-            "state_updates",
-            Prefetch("issues", queryset=Issue.filter(status__not=IssueStatus.CLOSED))
-        )
-    except DoesNotExist:
-        return None
+    return await Bike.filter(**kwargs).first().prefetch_related(
+        Prefetch("location_updates", queryset=LocationUpdate.all().limit(100)),
+        "state_updates",
+        Prefetch("issues", queryset=Issue.filter(status__not=IssueStatus.CLOSED))
+    )
 
 
 async def register_bike(public_key: Union[str, bytes], master_key: Union[str, bytes]) -> Bike:
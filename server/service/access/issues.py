@@ -3,7 +3,7 @@ Issues
 ======
 """
 from datetime import datetime
-from typing import Union, Tuple, List, Optional
+from typing import Union, Tuple, List, Optional, Dict
 
 from tortoise.query_utils import Prefetch
 
@@ -57,13 +57,10 @@ async def get_broken_bikes() -> List[Tuple[Bike, List[Issue]]]:
         'bike', 'bike__state_updates', Prefetch("bike__issues", queryset=Issue.filter(status__not=IssueStatus.CLOSED))
     )
 
-    broken_bikes = {}
+    broken_bikes: Dict[int, Tuple[Bike, List[Issue]]] = {}
 
     for issue in active_issues:
-        if issue.bike.identifier not in broken_bikes:
-            broken_bikes[issue.bike.identifier] = (issue.bike, [])
-
-        bike, issues = broken_bikes[issue.bike.identifier]
+        bike, issues = broken_bikes.setdefault(issue.bike_id, (issue.bike, []))
         issues.append(issue)
 
     return list(broken_bikes.values())
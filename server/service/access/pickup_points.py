@@ -10,7 +10,6 @@ from tortoise.contrib.gis.functions.comparison import Within
 
 from server.models.pickup_point import PickupPoint
 
-
 async def get_pickup_points(
     *,
     name: str = None
@@ -23,10 +22,24 @@ async def get_pickup_points(
     return await PickupPoint.all()
 
 
-async def get_pickup_point(pickup_id: int):
+async def get_pickup_point(pickup_id: int) -> Optional[PickupPoint]:
+    """
+    Gets a single pickup point.
+
+    :param pickup_id: The id of the pickup point.
+    """
     return await PickupPoint.filter(id=pickup_id).first()
 
 
+async def delete_pickup_point(pickup: PickupPoint):
+    """
+    Deletes a pickup point.
+
+    :param pickup: The pickup point to delete.
+    """
+    await pickup.delete()
+
+
 async def get_pickup_at(point: Point, srid=None) -> Optional[PickupPoint]:
     point_srid = PickupPoint.area.srid if srid is None else srid
     return await PickupPoint.filter(Within(
@@ -3,12 +3,12 @@ Rentals
 -------
 """
 from datetime import datetime
-from typing import Union, Optional, Tuple, List, AsyncIterable
+from typing import Union, Optional, Tuple, List
 
 from shapely.geometry import LineString
 
-from server.models import Bike, Rental, User
-from server.models.util import RentalUpdateType
+from server.models import Bike, Rental, RentalUpdate, User
+from server.models.util import TERMINATING_RENTAL_UPDATES, resolve_id
 
 
 async def get_rentals_for_bike(bike: Union[int, Bike]) -> List[Rental]:
@@ -18,14 +18,7 @@ async def get_rentals_for_bike(bike: Union[int, Bike]) -> List[Rental]:
     :param bike: The bike or id to fetch.
     :return: An iterable of rentals.
     """
-    if isinstance(bike, Bike):
-        bid = bike.id
-    elif isinstance(bike, int):
-        bid = bike
-    else:
-        raise TypeError("Must be bike id or bike.")
-
-    return await Rental.filter(bike__id=bid).prefetch_related('updates', 'bike')
+    return await Rental.filter(bike__id=resolve_id(bike)).prefetch_related('updates', 'bike')
 
 
 async def get_rentals(*, user: User = None) -> List[Rental]:
@@ -34,8 +27,17 @@ async def get_rentals(*, user: User = None) -> List[Rental]:
     return await Rental.all().prefetch_related('updates', 'bike')
 
 
-async def unfinished_rentals() -> AsyncIterable:
-    return (x async for x in Rental.all().prefetch_related("updates") if x.outcome is None)
+async def unfinished_rentals() -> List[Rental]:
+    """
+    Gets the rentals that have not yet been returned or cancelled, along with their updates and bike.
+
+    The finished rentals are looked up first and excluded by id, so only
+    the unfinished ones have their updates and bike prefetched.
+    """
+    finished = await RentalUpdate.filter(type__in=TERMINATING_RENTAL_UPDATES)
+    finished_ids = [update.rental_id for update in finished]
+    query = Rental.exclude(id__in=finished_ids) if finished_ids else Rental.all()
+    return await query.prefetch_related("updates", "bike")
 
 
 async def get_rental(rental_id: int) -> Rental:
@@ -51,14 +53,16 @@ async def get_rental_with_distance(rental: Union[Rental, int]) -> Union[
     "prefetch_related" functionality, since the location updates are needed in the rest of the system to get rental
     start and end.
 
-    :param rental: The rental or rental ID you wish to get.
+    :param rental: The rental or rental ID you wish to get. Rentals that already have their updates and bike
+        loaded are not fetched again.
     :returns: A tuple containing the rental and its distance.
 
     .. note:: Works with both PostGIS and Spatialite
     """
 
     if isinstance(rental, Rental):
-        await rental.fetch_related("updates", "bike")
+        if not rental.updates._fetched or not isinstance(rental.bike, Bike):
+            await rental.fetch_related("updates", "bike")
     elif isinstance(rental, int):
         rental = await Rental.filter(id=rental).first().prefetch_related("updates", "bike")
 
@@ -68,7 +72,7 @@ async def get_rental_with_distance(rental: Union[Rental, int]) -> Union[
         # the end time is either when the rental ended, or now.
         end_time = datetime.now()
         for update in reversed(rental.updates):
-            if update.type in (RentalUpdateType.RETURN, RentalUpdateType.CANCEL):
+            if update.type in TERMINATING_RENTAL_UPDATES:
                 end_time = update.time
 
         location_updates = await rental.bike.location_updates.filter(time__gt=start_time, time__lt=end_time)
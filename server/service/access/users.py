@@ -75,6 +75,22 @@ async def get_user(*, firebase_id=None, user_id=None) -> Optional[User]:
     return await User.filter(**kwargs).first()
 
 
+async def get_token_user(request, firebase_id: str = None) -> Optional[User]:
+    """
+    Gets the user for the verified token on the request.
+    The user is stored on the request, so it is only fetched once per request.
+
+    :param request: The request to store the user on.
+    :param firebase_id: The verified firebase id, defaulting to the token on the request.
+    :return: The user with the request's firebase id, or None if there is no token.
+    """
+    if "user" not in request:
+        if firebase_id is None:
+            firebase_id = request.get("token")
+        request["user"] = await get_user(firebase_id=firebase_id) if firebase_id is not None else None
+    return request["user"]
+
+
 async def create_user(first: str, email: str, firebase_id: str) -> User:
     """
     Creates a new user.
@@ -25,8 +25,8 @@ from weakref import WeakValueDictionary
 from aiohttp import WSCloseCode
 from aiohttp.web_ws import WebSocketResponse
 from haversine import haversine
-from more_itertools import chunked
 from shapely.geometry import Point, Polygon
+from shapely.prepared import prep
 from tortoise.query_utils import Prefetch
 
 from server import logger
@@ -99,9 +99,10 @@ class BikeConnectionManager:
 
     def bikes_in(self, area: Union[PickupPoint, Polygon]) -> List[int]:
         """Returns the bikes that are in the given polygon."""
+        polygon = prep(area.area if isinstance(area, PickupPoint) else area)
         return [
-            bike_id for bike_id, location in self._bike_locations.items()
-            if location[0].within(area.area if isinstance(area, PickupPoint) else area)
+            bike_id for bike_id, (point, _, _) in self._bike_locations.items()
+            if polygon.contains(point)
         ]
 
     async def update_location(
@@ -130,7 +131,7 @@ class BikeConnectionManager:
 
     async def low_battery(self, percent: float) -> List[Bike]:
         """Gets all bikes with less than the given battery level."""
-        low_battery_ids = {k: v for k, v in self._bike_battery.items() if v <= percent}
+        low_battery_ids = [bike_id for bike_id, level in self._bike_battery.items() if level <= percent]
         return await Bike.filter(id__in=low_battery_ids).prefetch_related(
             "state_updates",
             Prefetch("location_updates", queryset=LocationUpdate.all().limit(100)),
@@ -157,11 +158,25 @@ class BikeConnectionManager:
             await self._bike_connections[bike_id].close()
         self._bike_connections[bike_id] = socket
 
+    def remove_connection(self, target: Union[Bike, int], socket: WebSocketResponse):
+        """
+        Removes the bike's connection, as long as it is still the given socket.
+
+        A bike that reconnects replaces its old socket, so the old
+        socket closing must not remove the new connection.
+        """
+        bike_id = resolve_id(target)
+        if self._bike_connections.get(bike_id) is socket:
+            del self._bike_connections[bike_id]
+
     async def close_connections(self):
         if self._bike_connections:
             logger.info("Closing all open bike connections")
-        for connection in self._bike_connections.values():
-            await connection.close(code=WSCloseCode.GOING_AWAY)
+        # one misbehaving socket shouldn't stop the others from closing
+        await asyncio.gather(
+            *(connection.close(code=WSCloseCode.GOING_AWAY) for connection in list(self._bike_connections.values())),
+            return_exceptions=True
+        )
         self._bike_connections = {}
 
     @property
@@ -198,21 +213,19 @@ class BikeConnectionManager:
 
     async def closest_available_bike(self, user_location, rental_manager, reservation_manager):
 
-        def haversine_distance(p1, p2):
-            return haversine((p1.y, p1.x), (p2.y, p2.x), unit='mi')
+        user_coordinates = (user_location.y, user_location.x)
 
-        # sort bikes based on their distance to the lat and long
-        closest_bikes = (
-            (bid, point) for bid, (point, _, _) in
-            sorted(self._bike_locations.items(), key=lambda x: haversine_distance(user_location, x[1][0]))
+        # sort bikes based on their distance to the lat and long, computing each distance once
+        closest_bikes = sorted(
+            (haversine(user_coordinates, (point.y, point.x), unit='mi'), bid)
+            for bid, (point, _, _) in self._bike_locations.items()
         )
 
-        for bike_chunk in chunked(closest_bikes, 10):
-            bikes, locations = zip(*bike_chunk)
-            for bike, location in zip(await get_bikes(bike_ids=bikes), locations):
-                connected = self.is_connected(bike)
-                rented = not rental_manager.is_available(bike, reservation_manager)
-                if connected and not rented:
-                    return bike, haversine_distance(user_location, location)
+        # availability is known in memory, so only the chosen bike needs to be loaded
+        for distance, bike_id in closest_bikes:
+            if self.is_connected(bike_id) and rental_manager.is_available(bike_id, reservation_manager):
+                bikes = await get_bikes(bike_ids=[bike_id])
+                if bikes:
+                    return bikes[0], distance
 
         return None, None
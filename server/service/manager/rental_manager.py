@@ -14,22 +14,30 @@ This object handles everything needed for bike rentals.
 - getting active rentals
 - estimating rental price
 """
-
-from datetime import datetime
-from typing import Dict, Union, Tuple, List, Optional
+import asyncio
+from asyncio import Future
+from datetime import datetime, timedelta
+from typing import Dict, Union, Tuple, List, Optional, Set
 
 from shapely.geometry import Point
 from tortoise.query_utils import Prefetch
 
+from server import logger
 from server.events import EventHub, EventList
 from server.models import Bike, Rental, User, RentalUpdate, LocationUpdate
 from server.models.issue import IssueStatus, Issue
-from server.models.util import RentalUpdateType
+from server.models.util import RentalUpdateType, resolve_id
 from server.pricing import get_price
 from server.service.access.rentals import get_rental_with_distance, unfinished_rentals
 from server.service.payment import PaymentManager, CustomerError
 from server.service.rebuildable import Rebuildable
 
+UPDATE_FLUSH_INTERVAL = timedelta(milliseconds=50)
+"""The maximum amount of time a rental update waits to be written with others."""
+
+UPDATE_FLUSH_SIZE = 100
+"""The number of pending rental updates that triggers an immediate write."""
+
 
 class InactiveRentalError(Exception):
     pass
@@ -73,9 +81,24 @@ class RentalManager(Rebuildable):
         self._active_rentals: Dict[int, Tuple[int, int]] = {}
         """Maps user ids to a tuple containing their current rental and current bike."""
 
+        self._rentals: Dict[int, Rental] = {}
+        """Maps the ids of the active rentals to the rentals themselves (with their updates and bike)."""
+
+        self._active_bike_ids: Set[int] = set()
+        """The ids of the bikes that are currently being rented."""
+
         self.hub = EventHub(RentalEvent)
         self._payment_manager = payment_manager
 
+        self._pending_updates: List[RentalUpdate] = []
+        """The rental updates waiting to be written."""
+
+        self._flush_task: Optional[asyncio.Task] = None
+        """The background task writing the pending rental updates, if any are pending."""
+
+        self._flush_wakeup: Optional[Future] = None
+        """Resolved to write the pending rental updates without waiting out the interval."""
+
     async def create(self, user: User, bike: Bike) -> Tuple[Rental, Point]:
         """
         Creates a new rental for a user.
@@ -96,9 +119,11 @@ class RentalManager(Rebuildable):
         rental.bike = bike
         rental.user = user
 
-        await self._publish_event(rental, RentalUpdateType.RENT)
-        self._active_rentals[user.id] = (rental.id, bike.id)
         await rental.fetch_related("updates")
+        self._publish_event(rental, RentalUpdateType.RENT)
+        self._active_rentals[user.id] = (rental.id, bike.id)
+        self._active_bike_ids.add(bike.id)
+        self._rentals[rental.id] = rental
 
         current_location = await LocationUpdate.filter(bike=bike).first()
         self.hub.emit(RentalEvent.rental_started, user, bike, current_location.location)
@@ -120,8 +145,10 @@ class RentalManager(Rebuildable):
 
         if success:
             del self._active_rentals[user.id]
+            self._rentals.pop(rental.id, None)
+            self._active_bike_ids.discard(rental.bike_id)
             await rental.save()
-            await self._publish_event(rental, RentalUpdateType.RETURN)
+            self._publish_event(rental, RentalUpdateType.RETURN)
             self.hub.emit(RentalEvent.rental_ended, user, rental.bike, current_location.location, rental.price,
                           distance)
         else:
@@ -133,30 +160,29 @@ class RentalManager(Rebuildable):
         """Cancels a rental, effective immediately, waiving the rental fee."""
         rental, distance = await self._get_rental_with_distance(user)
 
-        await self._publish_event(rental, RentalUpdateType.CANCEL)
+        self._publish_event(rental, RentalUpdateType.CANCEL)
         self.hub.emit(RentalEvent.rental_cancelled, user, rental.bike)
 
         del self._active_rentals[user.id]
+        self._rentals.pop(rental.id, None)
+        self._active_bike_ids.discard(rental.bike_id)
         return rental
 
     async def active_rentals(self) -> List[Rental]:
         """Gets all the active rentals."""
-        active_rental_ids = [rental_id for rental_id, bike_id in self._active_rentals.values()]
-        return await Rental.filter(id__in=active_rental_ids).prefetch_related('updates', 'bike')
+        return list(self._rentals.values())
 
     async def active_rental(self, user: Union[User, int], *, with_locations=False) -> Optional[Union[Rental, Tuple]]:
         """Gets the active rental for a given user."""
-        if isinstance(user, int):
-            user_id = user
-        if isinstance(user, User):
-            user_id = user.id
-
-        rental_id, bike_id = self._active_rentals.get(user_id, (None, None))
+        rental_id, bike_id = self._active_rentals.get(resolve_id(user), (None, None))
 
         if rental_id is None:
             return None
 
-        rental = await Rental.filter(id=rental_id).first().prefetch_related('updates', 'bike')
+        rental = self._rentals.get(rental_id)
+        if rental is None:
+            rental = await Rental.filter(id=rental_id).first().prefetch_related('updates', 'bike')
+
         if with_locations:
             locations = await LocationUpdate.filter(bike_id=bike_id,
                                                     time__gte=rental.updates[0].time.strftime("%Y-%m-%d %H:%M:%S"))
@@ -169,16 +195,15 @@ class RentalManager(Rebuildable):
 
     def has_active_rental(self, user: Union[User, int]) -> bool:
         """Checks if the given user has an active rental."""
-        return (user if isinstance(user, int) else user.id) in self._active_rentals
+        return resolve_id(user) in self._active_rentals
 
     def is_active(self, rental_id):
         """Checks if the given rental ID is currently active."""
-        return rental_id in {rental for rental, bike in self._active_rentals.values()}
+        return rental_id in self._rentals
 
     def is_in_use(self, bike: Union[Bike, int]) -> bool:
         """Checks if the given bike is in use."""
-        bid = bike.id if isinstance(bike, Bike) else bike
-        return any(bid == rental[1] for rental in self._active_rentals.values())
+        return resolve_id(bike) in self._active_bike_ids
 
     def is_available(self, bike: Union[Bike, int], reservation_manager) -> bool:
         """A bike is available if the bike is un-rented and it is not reserved."""
@@ -186,21 +211,22 @@ class RentalManager(Rebuildable):
 
     def is_renting(self, user_id: int, bike_id: int) -> bool:
         """Checks if the given user is renting the given bike."""
-        return user_id in self._active_rentals and self._active_rentals[user_id][1] == bike_id
+        rental_id, renting_id = self._active_rentals.get(user_id, (None, None))
+        return renting_id is not None and renting_id == bike_id
 
     async def get_price_estimate(self, rental: Union[Rental, int]) -> float:
         """Gets the price of the rental so far."""
         if isinstance(rental, int):
-            rental = await Rental.filter(id=rental).first()
-        elif isinstance(rental, Rental):
-            rental = rental
+            rental_id = rental
+            rental = self._rentals.get(rental_id)
+            if rental is None:
+                rental = await Rental.filter(id=rental_id).first().prefetch_related('updates')
 
         return await get_price(rental.start_time, datetime.now())
 
     async def get_available_bikes_out_of(self, bike_ids: List[int]) -> List[Bike]:
         """Given a list of bike ids, checks if they are free or not and returns the ones that are free."""
-        used_bikes = {bike_id for rental_id, bike_id in self._active_rentals.values()}
-        available_bikes = set(bike_ids) - used_bikes
+        available_bikes = set(bike_ids) - self._active_bike_ids
 
         if not available_bikes:
             return []
@@ -219,8 +245,10 @@ class RentalManager(Rebuildable):
 
         Also replays events that happened today for use by subscribers.
         """
-        async for rental in await unfinished_rentals():
+        for rental in await unfinished_rentals():
             self._active_rentals[rental.user_id] = (rental.id, rental.bike_id)
+            self._rentals[rental.id] = rental
+            self._active_bike_ids.add(rental.bike_id)
 
         midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         todays_updates = await RentalUpdate.filter(time__gt=midnight).prefetch_related("rental", "rental__user",
@@ -240,16 +268,69 @@ class RentalManager(Rebuildable):
         if not isinstance(user, User):
             raise TypeError(f"Supplied target must be a Rental or User, not {type(user)}")
 
-        if user.id not in self._active_rentals:
+        try:
+            rental_id, bike_id = self._active_rentals[user.id]
+        except KeyError:
             raise InactiveRentalError("Given user has no active rentals!")
-        rental_id, bike_id = self._active_rentals[user.id]
-        rental, distance = await get_rental_with_distance(rental_id)
+        rental, distance = await get_rental_with_distance(self._rentals.get(rental_id, rental_id))
 
         return rental, distance
 
-    @staticmethod
-    async def _publish_event(rental: Rental, event_type: RentalUpdateType):
-        update = await RentalUpdate.create(rental=rental, type=event_type)
+    def _publish_event(self, rental: Rental, event_type: RentalUpdateType) -> RentalUpdate:
+        """
+        Adds a rental update to the rental, and queues it to be written in the background.
 
+        The caller does not wait for the write. Updates published within
+        :data:`UPDATE_FLUSH_INTERVAL` of each other are written together,
+        or straight away once :data:`UPDATE_FLUSH_SIZE` of them are pending.
+        """
+        update = RentalUpdate(rental=rental, type=event_type, time=datetime.now())
         if rental.updates._fetched:
             rental.updates.related_objects.append(update)
+
+        self._pending_updates.append(update)
+        if self._flush_task is None:
+            loop = asyncio.get_running_loop()
+            self._flush_wakeup = loop.create_future()
+            self._flush_task = loop.create_task(self._flush_updates())
+        elif len(self._pending_updates) >= UPDATE_FLUSH_SIZE:
+            self._wake_flush()
+
+        return update
+
+    async def write_pending_updates(self):
+        """Writes the queued rental updates without waiting out the interval."""
+        if self._flush_task is not None:
+            self._wake_flush()
+            await self._flush_task
+
+    def _wake_flush(self):
+        """Stops the flush task waiting out the interval."""
+        if self._flush_wakeup is not None and not self._flush_wakeup.done():
+            self._flush_wakeup.set_result(None)
+
+    async def _flush_updates(self):
+        """Writes the pending rental updates in batches until none are left."""
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending_updates:
+                if len(self._pending_updates) < UPDATE_FLUSH_SIZE:
+                    await asyncio.wait([self._flush_wakeup], timeout=UPDATE_FLUSH_INTERVAL.total_seconds())
+
+                # a wakeup during the write skips the next wait
+                self._flush_wakeup = loop.create_future()
+                batch, self._pending_updates = self._pending_updates, []
+                await self._write_updates(batch)
+        finally:
+            self._flush_task = None
+            self._flush_wakeup = None
+
+    @staticmethod
+    async def _write_updates(batch: List[RentalUpdate]):
+        """Saves a batch of rental updates, logging the ones that could not be written."""
+        try:
+            for update in batch:
+                await update.save()
+        except Exception:
+            unsaved = [update for update in batch if update.id is None]
+            logger.exception("Could not write %d rental updates", len(unsaved))
@@ -29,7 +29,7 @@ This object handles everything needed for bike reservations.
 """
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Tuple, Set, Optional, List
+from typing import Dict, Tuple, Set, Optional, List, Iterable
 
 from shapely.geometry import Point
 
@@ -119,10 +119,11 @@ class ReservationManager(Rebuildable):
 
         active_reservations = await current_reservations(user)
         valid_reservations = []
+        now = datetime.now(timezone.utc)
 
         for reservation in active_reservations:
             upper_bound = reservation.reserved_for + RESERVATION_WINDOW / 2
-            if datetime.now(timezone.utc) >= upper_bound:
+            if now >= upper_bound:
                 reservation.outcome = ReservationOutcome.EXPIRED
                 await reservation.save()
             elif collection_location.within(reservation.pickup_point.area):
@@ -135,23 +136,27 @@ class ReservationManager(Rebuildable):
         lower_bound = reservation.reserved_for - RESERVATION_WINDOW / 2
         upper_bound = reservation.reserved_for + RESERVATION_WINDOW / 2
 
-        if not lower_bound <= datetime.now(timezone.utc) <= upper_bound:
+        if not lower_bound <= now <= upper_bound:
             raise CollectionError(
                 f"You may only collect a rental in a {RESERVATION_WINDOW} window around {reservation.reserved_for}."
             )
 
-        available_bikes = await self.available_bikes(reservation.pickup_point)
-        if not available_bikes:
+        bike_ids = self._bike_connection_manager.bikes_in(reservation.pickup_point.area)
+        if not bike_ids:
             raise ReservationError("No bikes at this pickup point.")
 
         pickup = self._pickup_containing(bike)
         if not pickup or pickup.id != reservation.pickup_point.id:
             raise CollectionError("Requested bike is not in the pickup point of the reservation.")
 
-        if bike not in available_bikes:
+        # only go to the database for the alternatives when the requested bike is taken
+        if self._rental_manager.is_in_use(bike):
+            available_bikes = await self._rental_manager.get_available_bikes_out_of(bike_ids)
+            if not available_bikes:
+                raise ReservationError("No bikes at this pickup point.")
             raise CurrentlyRentedError("Requested bike is currently being rented.", available_bikes)
 
-        rental, start_location = await self._rental_manager.create(reservation.user, available_bikes[0])
+        rental, start_location = await self._rental_manager.create(reservation.user, bike)
         reservation.claimed_rental = rental
         await self._close_reservation(reservation, ReservationOutcome.CANCELLED)
 
@@ -182,6 +187,34 @@ class ReservationManager(Rebuildable):
         bikes = self._bike_connection_manager.bikes_in(pickup.area)
         return len(bikes) <= len(self.reservations[pickup.id])
 
+    def reserved_bikes(self, bikes: Iterable[Bike]) -> Set[int]:
+        """
+        Gets the ids of the given bikes that are reserved.
+
+        This is the batched form of :meth:`is_reserved`, which
+        only counts the bikes in each pickup point once.
+        """
+        pickup_reserved: Dict[int, bool] = {}
+        reserved = set()
+
+        for bike in bikes:
+            try:
+                pickup = self._pickup_containing(bike)
+            except ValueError:
+                continue
+
+            if pickup is None:
+                continue
+
+            if pickup.id not in pickup_reserved:
+                pickup_bikes = self._bike_connection_manager.bikes_in(pickup.area)
+                pickup_reserved[pickup.id] = len(pickup_bikes) <= len(self.reservations[pickup.id])
+
+            if pickup_reserved[pickup.id]:
+                reserved.add(bike.id)
+
+        return reserved
+
     def pickup_bike_surplus(self, pickup_point) -> int:
         """
         Returns how many more free bikes there are than reservations.
@@ -189,9 +222,10 @@ class ReservationManager(Rebuildable):
         A negative value indicates a shortage.
         """
         available_bike_count = len(self._bike_connection_manager.bikes_in(pickup_point.area))
+        reservation_cutoff = datetime.now(timezone.utc) + MINIMUM_RESERVATION_TIME
         bikes_needed_for_reservations = len([
             rid for rid, uid, time in self.reservations[pickup_point.id]
-            if time < datetime.now(timezone.utc) + MINIMUM_RESERVATION_TIME
+            if time < reservation_cutoff
         ])
 
         return available_bike_count - bikes_needed_for_reservations
@@ -1,19 +1,49 @@
 import abc
-import asyncio
-from concurrent.futures.thread import ThreadPoolExecutor
-from functools import partial
-from typing import Optional
+from typing import Optional, Dict
 
 import aiohttp
-import stripe
 
 from server.models import User, Rental
 
+STRIPE_API_URL = "https://api.stripe.com/v1"
+"""The base url for the stripe REST api."""
+
+STRIPE_TIMEOUT = 10
+"""The number of seconds to wait for stripe to respond."""
+
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Gets the session shared by all payment managers, creating it on first use."""
+    global _SESSION
+
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, limit_per_host=20, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=STRIPE_TIMEOUT)
+        )
+
+    return _SESSION
+
+
+async def close_session():
+    """Closes the shared session, if it was ever opened."""
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+
 
 class CustomerError(Exception):
     pass
 
 
+class PaymentError(Exception):
+    """Raised when stripe rejects a request."""
+
+    def __init__(self, message):
+        self.message = message
+
+
 class PaymentManager(abc.ABC):
     @abc.abstractmethod
     async def create_customer(self, user, source_token):
@@ -63,18 +93,26 @@ class PaymentManager(PaymentManager):
         """
         Creates a new instance of the PaymentManager class.
         """
-        stripe.api_key = stripe_key
-        self._session = aiohttp.ClientSession()
+        self._headers = {"Authorization": f"Bearer {stripe_key}"}
 
-        self._loop = asyncio.get_event_loop()
-        self._executor = ThreadPoolExecutor()
+    async def _request(self, method: str, path: str, **data) -> Dict:
+        """
+        Makes a request against the stripe api.
 
-    async def _run_in_executor(self, func, *args, **kwargs):
-        pfunc = partial(func, *args, **kwargs)
-        return await self._loop.run_in_executor(
-            self._executor,
-            pfunc
-        )
+        :raises PaymentError: If stripe responds with an error, or with something other than JSON.
+        """
+        session = get_session()
+        async with session.request(method, STRIPE_API_URL + path, data=data or None, headers=self._headers) as response:
+            try:
+                body = await response.json()
+            except (aiohttp.ContentTypeError, ValueError):
+                # a proxy in front of stripe may answer with an html error page
+                raise PaymentError(f"Stripe responded with an unreadable {response.status} response.")
+
+        if response.status >= 400:
+            raise PaymentError(body.get("error", {}).get("message", "Stripe rejected the request."))
+
+        return body
 
     async def create_customer(self, user: User, source_token: str):
         """
@@ -83,15 +121,14 @@ class PaymentManager(PaymentManager):
         :param user: The user to create it for.
         :param source_token: The payment source to assign to the account.
         """
-
-        customer = await self._run_in_executor(
-            stripe.Customer.create,
+        customer = await self._request(
+            "POST", "/customers",
             email=user.email,
             description=user.first,
             source=source_token
         )
 
-        user.stripe_id = customer.id
+        user.stripe_id = customer["id"]
         await user.save()
 
     async def is_customer(self, user: User) -> bool:
@@ -104,10 +141,9 @@ class PaymentManager(PaymentManager):
         :param user: The user to update.
         :param source_token: The new payment source to assign to the account.
         """
-        await self._run_in_executor(
-            stripe.Customer.modify,
-            user.stripe_id,
-            source=source_token,
+        await self._request(
+            "POST", f"/customers/{user.stripe_id}",
+            source=source_token
         )
 
     async def delete_customer(self, user: User):
@@ -116,10 +152,7 @@ class PaymentManager(PaymentManager):
 
         :param user: The user to delete.
         """
-        await self._run_in_executor(
-            stripe.Customer.delete,
-            user.stripe_id
-        )
+        await self._request("DELETE", f"/customers/{user.stripe_id}")
 
         user.stripe_id = None
         await user.save()
@@ -134,12 +167,12 @@ class PaymentManager(PaymentManager):
         """
         distance_string = "" if distance is None else f"{distance:.2f} miles "
 
-        charge = await self._run_in_executor(
-            stripe.Charge.create,
-            amount=rental.price,
+        charge = await self._request(
+            "POST", "/charges",
+            amount=str(rental.price),
             currency='gbp',
             description=f'Travelled {distance_string}on bike {rental.bike.identifier}',
             customer=user.stripe_id
         )
 
-        return charge.status == "succeeded", charge.receipt_url
+        return charge["status"] == "succeeded", charge["receipt_url"]
@@ -0,0 +1,67 @@
+"""
+Pickup Point Cache
+------------------
+
+Keeps the pickup points in memory.
+
+Pickup points change rarely, so they are only
+refreshed from the database every :data:`PICKUP_CACHE_TTL`.
+"""
+
+from datetime import timedelta
+from time import monotonic
+from typing import Dict, List, Optional
+
+from server.models.pickup_point import PickupPoint
+from server.service.access.pickup_points import get_pickup_points, get_pickup_point, delete_pickup_point
+
+PICKUP_CACHE_TTL = timedelta(seconds=60)
+"""How long the cached pickup points are used before they are fetched again."""
+
+
+class PickupPointCache:
+    """
+    Serves the pickup points from memory, going to the
+    database once the cached points are older than
+    :data:`PICKUP_CACHE_TTL`, or after one is deleted.
+    """
+
+    _pickups: Dict[int, PickupPoint]
+    """The cached pickup points, keyed by id."""
+
+    _expiry: float
+    """When the cached pickup points go stale, in :func:`time.monotonic` seconds."""
+
+    def __init__(self):
+        self._pickups = {}
+        self._expiry = 0.0
+
+    async def get_pickup_points(self) -> List[PickupPoint]:
+        """Gets all the pickup points."""
+        return list((await self._cached_pickup_points()).values())
+
+    async def get_pickup_point(self, pickup_id: int) -> Optional[PickupPoint]:
+        """Gets a single pickup point by its id."""
+        pickup = (await self._cached_pickup_points()).get(pickup_id)
+        if pickup is None:
+            # it may have been added since the cache was last refreshed
+            pickup = await get_pickup_point(pickup_id)
+        return pickup
+
+    async def delete_pickup_point(self, pickup: PickupPoint):
+        """Deletes a pickup point, dropping the cached points."""
+        await delete_pickup_point(pickup)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops the cached pickup points, forcing the next read to go to the database."""
+        self._pickups = {}
+        self._expiry = 0.0
+
+    async def _cached_pickup_points(self) -> Dict[int, PickupPoint]:
+        """Gets the pickup points keyed by id, refreshing them from the database if they are stale."""
+        if monotonic() >= self._expiry:
+            self._pickups = {pickup.id: pickup for pickup in await get_pickup_points()}
+            self._expiry = monotonic() + PICKUP_CACHE_TTL.total_seconds()
+
+        return self._pickups
@@ -9,8 +9,10 @@ to be persisted.
 """
 
 from asyncio import sleep
-from datetime import datetime, timedelta
-from typing import Set, NamedTuple
+from collections import deque
+from datetime import timedelta
+from time import monotonic
+from typing import Dict, NamedTuple, Deque
 
 from nacl.utils import random
 
@@ -26,7 +28,8 @@ class BikeConnectionTicket(NamedTuple):
     challenge: bytes
     bike: Bike
     remote: str
-    timestamp: datetime
+    timestamp: float
+    """When the ticket was issued, in :func:`time.monotonic` seconds."""
 
     def __hash__(self):
         """Hashes the ticket based on the remote and the public key."""
@@ -50,53 +53,73 @@ class TicketStore:
     per IP address / public key combination at any time.
     """
 
-    _tickets: Set[BikeConnectionTicket]
-    """A map of IP addresses and their currently issued tickets"""
+    _tickets: Dict[str, Dict[bytes, BikeConnectionTicket]]
+    """A map of IP addresses to their currently issued tickets, keyed by public key."""
+
+    _issued: Deque[BikeConnectionTicket]
+    """The issued tickets, oldest first, including ones that have since been popped or replaced."""
 
     def __init__(self, *, max_tickets_per_remote=10, expiry_period=timedelta(seconds=10)):
-        self._tickets = set()
+        self._tickets = {}
+        self._issued = deque()
         self.max_tickets_per_remote = max_tickets_per_remote
         self.expiry_period = expiry_period
 
     def add_ticket(self, remote, bike: Bike) -> bytes:
         """
-        Adds a ticket to the store.
+        Adds a ticket to the store, replacing any
+        open ticket for the same remote and bike.
 
         :raises TooManyTicketError: The ticket queue is full.
         """
 
-        tickets = {t for t in self._tickets if t.remote == remote}
+        self.remove_expired()
+        tickets = self._tickets.setdefault(remote, {})
 
         if len(tickets) >= self.max_tickets_per_remote:
             raise TooManyTicketError()
 
         challenge = random(64)
-        ticket = BikeConnectionTicket(challenge, bike, remote, datetime.now())
-
-        self._tickets.add(ticket)
+        ticket = BikeConnectionTicket(challenge, bike, remote, monotonic())
+        tickets[bike.public_key] = ticket
+        self._issued.append(ticket)
         return challenge
 
     def pop_ticket(self, remote, public_key: bytes) -> BikeConnectionTicket:
         """Pops the ticket with the given id, excluding expired ones."""
-        match = {t for t in self._tickets if t.bike.public_key == public_key and t.remote == remote}
-        if not match:
+        tickets = self._tickets.get(remote, {})
+        ticket = tickets.pop(public_key, None)
+        if ticket is None:
             raise KeyError("No such ticket")
-        self._tickets -= match
-        return match.pop()
+
+        if not tickets:
+            del self._tickets[remote]
+        return ticket
 
     async def remove_all_expired(self, removal_period: timedelta):
         """Clears all the expired tickets."""
+        period = removal_period.total_seconds()
         while True:
-            await sleep(removal_period.seconds)
+            await sleep(period)
             logger.debug("Clearing expired tickets")
             self.remove_expired()
 
     def remove_expired(self):
-        """Clears expired tickets for a remote."""
-        self._tickets = {t for t in self._tickets if not self._is_expired(t)}
+        """
+        Clears expired tickets for all remotes.
 
-    def _is_expired(self, ticket: BikeConnectionTicket):
-        return ticket.timestamp + self.expiry_period <= datetime.now()
+        Tickets are issued in order, so this only
+        has to look at the ones that have expired.
+        """
+        issued_before = monotonic() - self.expiry_period.total_seconds()
+        while self._issued and self._issued[0].timestamp <= issued_before:
+            ticket = self._issued.popleft()
+            tickets = self._tickets.get(ticket.remote)
+            if tickets is None or tickets.get(ticket.bike.public_key) is not ticket:
+                continue  # already popped or replaced
+            del tickets[ticket.bike.public_key]
+            if not tickets:
+                del self._tickets[ticket.remote]
 
     def __contains__(self, remote):
         """Check if a remote has any open tickets"""
@@ -5,14 +5,70 @@ Verify Token
 A number of API token verification strategies.
 """
 import asyncio
+import re
+import time
 from abc import ABC, abstractmethod
-from datetime import timedelta
-from typing import Dict
+from collections import OrderedDict
+from datetime import timedelta, datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple, Mapping
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, TCPConnector
 from aiohttp.web_request import Request
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from cryptography.x509 import load_pem_x509_certificate
 from jose import jwt, ExpiredSignatureError, JWTError
 
+CLAIMS_CACHE_TTL = 5.0
+"""The number of seconds a verified token is trusted without checking its signature again."""
+
+CLAIMS_CACHE_SIZE = 4096
+"""The maximum number of verified tokens to remember."""
+
+KEY_REFRESH_MARGIN = timedelta(minutes=5)
+"""How long before the certificates expire that they are refreshed."""
+
+KEY_REFRESH_MINIMUM = timedelta(minutes=1)
+"""The shortest time between two certificate refreshes."""
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+_DECODE_OPTIONS = {
+    True: {'verify_exp': True},
+    False: {'verify_exp': False},
+}
+
+
+def cache_lifetime(headers: Mapping[str, str]) -> Optional[timedelta]:
+    """
+    Gets how long a response may be cached for from its
+    Cache-Control or Expires header, if either is present.
+    """
+    match = _MAX_AGE.search(headers.get("Cache-Control", ""))
+    if match:
+        return timedelta(seconds=int(match.group(1)))
+
+    try:
+        expires = parsedate_to_datetime(headers["Expires"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if expires.tzinfo is None:
+        # a -0000 zone parses as naive, but still means UTC
+        expires = expires.replace(tzinfo=timezone.utc)
+    return expires - datetime.now(timezone.utc)
+
+
+def _load_public_key(certificate: str) -> RSAPublicKey:
+    """Extracts the public key from a PEM encoded x509 certificate."""
+    return load_pem_x509_certificate(certificate.encode()).public_key()
+
+
+def _is_expired(claims: Mapping) -> bool:
+    """Checks the expiry of some (possibly unverified) claims, leaving malformed ones to the full decode."""
+    expiry = claims.get("exp")
+    return isinstance(expiry, int) and expiry < time.time()
+
 
 class TokenVerificationError(Exception):
     def __init__(self, message, auth_header=None):
@@ -38,23 +94,74 @@ class FirebaseVerifier(TokenVerifier):
 
     _public_key_url = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
     _certificates: Dict[str, str]
+    _keys: Dict[str, RSAPublicKey]
+    _cache: "OrderedDict[str, Tuple[str, float]]"
 
     def __init__(self, audience):
         self._certificates = {}
+        self._keys = {}
+        self._session: Optional[ClientSession] = None
+        self._validators: Dict[str, str] = {}
+        self._lifetime: Optional[timedelta] = None
+        self._cache = OrderedDict()
         self.audience = audience
+        self._algorithms = ('RS256',)
 
     async def _get_keys(self):
-        async with ClientSession() as session:
-            request = await session.get(self._public_key_url)
+        if self._session is None:
+            self._session = ClientSession(connector=TCPConnector(limit=4, keepalive_timeout=300))
+
+        async with self._session.get(self._public_key_url, headers=self._validators) as request:
+            self._lifetime = cache_lifetime(request.headers)
+            if request.status == 304:
+                return
+            request.raise_for_status()
             self._certificates = await request.json()
+            self._keys = {kid: _load_public_key(pem) for kid, pem in self._certificates.items()}
+            self._validators = {
+                header: request.headers[source]
+                for header, source in (("If-None-Match", "ETag"), ("If-Modified-Since", "Last-Modified"))
+                if source in request.headers
+            }
+
+    async def close(self):
+        """Closes the session used to fetch the certificates."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def get_keys(self, update_period: timedelta = None):
+        """
+        Fetches the certificates, and optionally keeps them up to date.
+
+        :param update_period: The refresh period to fall back on when the
+            response doesn't say how long the certificates are valid for.
+            If omitted, the certificates are only fetched once.
+        """
         if update_period is None:
             await self._get_keys()
             return
         while True:
             await self._get_keys()
-            await asyncio.sleep(update_period.total_seconds())
+            if self._lifetime is not None:
+                delay = max(KEY_REFRESH_MINIMUM, self._lifetime - KEY_REFRESH_MARGIN)
+            else:
+                delay = update_period
+            await asyncio.sleep(delay.total_seconds())
+
+    def _public_key(self, kid) -> RSAPublicKey:
+        """
+        Gets the public key for the given key id, parsing its
+        certificate the first time it is used.
+
+        :raises JWTError: When there is no certificate for the key id.
+        """
+        key = self._keys.get(kid)
+        if key is None:
+            if kid not in self._certificates:
+                raise JWTError("Token signed with an unknown key.")
+            key = self._keys[kid] = _load_public_key(self._certificates[kid])
+        return key
 
     def verify_token(self, token, verify_exp=True):
         if not self._certificates:
@@ -63,20 +170,43 @@ class FirebaseVerifier(TokenVerifier):
         if not isinstance(token, str):
             raise TypeError(f"Token must be of type string, not {type(token)}")
 
+        now = time.monotonic()
+        cached = self._cache.get(token) if verify_exp else None
+        if cached is not None:
+            user_id, deadline = cached
+            if now < deadline:
+                self._cache.move_to_end(token)
+                return user_id
+            del self._cache[token]
+
         try:
+            # reject stale tokens before paying for the signature check
+            if verify_exp and _is_expired(jwt.get_unverified_claims(token)):
+                raise ExpiredSignatureError("Signature has expired.")
+            key = self._public_key(jwt.get_unverified_header(token).get("kid"))
             claims = jwt.decode(
                 token,
-                self._certificates,
-                algorithms='RS256',
+                key,
+                algorithms=self._algorithms,
                 audience=self.audience,
-                options={'verify_exp': verify_exp}
+                options=_DECODE_OPTIONS[verify_exp]
             )
         except ExpiredSignatureError as e:
             raise TokenVerificationError("Token is expired.", token) from e
         except JWTError as e:
             raise TokenVerificationError("Token is invalid.", token) from e
 
-        return claims.get("user_id")
+        user_id = claims.get("user_id")
+        expiry = claims.get("exp")
+        if verify_exp and isinstance(expiry, (int, float)):
+            # never trust a cached token past its own expiry
+            lifetime = min(CLAIMS_CACHE_TTL, expiry - time.time())
+            if lifetime > 0:
+                self._cache[token] = (user_id, now + lifetime)
+                if len(self._cache) > CLAIMS_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+        return user_id
 
 
 class DummyVerifier(TokenVerifier):
@@ -85,7 +215,7 @@ class DummyVerifier(TokenVerifier):
     """
 
     def verify_token(self, token: str) -> str:
-        if not isinstance(token, str) or not len(token) > 0:
+        if not isinstance(token, str) or not token:
             raise TokenVerificationError("Invalid")
 
         return token
@@ -94,19 +224,21 @@ class DummyVerifier(TokenVerifier):
 def verify_token(request: Request):
     """
     Checks a view for the existence of a valid Authorization header.
+    The token is stored on the request, so it is only verified once per request.
 
     :param request: The view to check.
     :return: The valid token.
     :raises TokenVerificationError: When the Authorize header is invalid.
     """
-    if "Authorization" not in request.headers:
+    if "token" in request:
+        return request["token"]
+
+    auth_header = request.headers.get("Authorization")
+    if auth_header is None:
         raise TokenVerificationError("The Authorization header was not included.")
 
-    auth_header = request.headers["Authorization"]
     if not auth_header.startswith("Bearer "):
         raise TokenVerificationError("The Authorization header must be of the format \"Bearer $TOKEN\".", auth_header)
 
-    try:
-        return request.app["token_verifier"].verify_token(request.headers["Authorization"][7:])
-    except TokenVerificationError as error:
-        raise error
+    request["token"] = request.app["token_verifier"].verify_token(auth_header[7:])
+    return request["token"]
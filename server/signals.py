@@ -12,14 +12,21 @@ from asyncio import CancelledError
 from contextlib import suppress
 from datetime import timedelta
 
+from aiohttp import ClientError
 from aiohttp.abc import Application
 from tortoise import Tortoise
 from tortoise.exceptions import OperationalError
 
 from server import logger
+from server.service import payment
 from server.service.rebuildable import Rebuildable
 from server.service.verify_token import FirebaseVerifier
-from server.views import BikeSocketView
+
+PICKUP_AREA_INDEX = "CREATE INDEX IF NOT EXISTS pickuppoint_area_idx ON pickuppoint USING GIST (area);"
+"""
+A spatial index on the pickup point areas, so that the location lookup
+for every bike update is an index scan rather than a sequential one.
+"""
 
 
 async def close_bike_connections(app: Application):
@@ -32,6 +39,31 @@ async def close_database_connections(app: Application):
     await Tortoise.close_connections()
 
 
+async def write_rental_updates(app: Application):
+    """Writes the queued rental updates while the database is still open."""
+    await app['rental_manager'].write_pending_updates()
+
+
+async def close_payment_connections(app: Application):
+    """Closes the connection pool to the payment provider."""
+    await payment.close_session()
+
+
+async def close_token_verifier(app: Application):
+    """Closes the connection used to refresh the token verification keys."""
+    if isinstance(app['token_verifier'], FirebaseVerifier):
+        await app['token_verifier'].close()
+
+
+async def fetch_verification_keys(app: Application):
+    """Fetches the token verification keys so that the first requests can be authenticated."""
+    if isinstance(app['token_verifier'], FirebaseVerifier):
+        try:
+            await app['token_verifier'].get_keys()
+        except ClientError as error:
+            logger.warning("Could not fetch the token verification keys: %s", error)
+
+
 async def initialize_database(app: Application):
     """Initializes and generates the schema for our database."""
     await Tortoise.init(
@@ -43,19 +75,23 @@ async def initialize_database(app: Application):
     except OperationalError:
         pass
 
+    # spatialite only uses its r-tree indexes when queried explicitly, so we only index postgis
+    if app['database_uri'].startswith("postgis"):
+        await Tortoise.get_connection("default").execute_script(PICKUP_AREA_INDEX)
+
 
 async def rebuild_event_states(app: Application):
     """Rebuilds the event-based state from the database."""
-    for rebuildable in (x for x in app.values() if isinstance(x, Rebuildable)):
-        await rebuildable._rebuild()
+    await asyncio.gather(*(x._rebuild() for x in app.values() if isinstance(x, Rebuildable)))
 
 
 async def start_background_tasks(app: Application):
     """Starts the background tasks."""
     logger.info("Starting Background Tasks")
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
+    remove_expired_tickets = app['ticket_store'].remove_all_expired
 
-    app['ticket_cleaner'] = loop.create_task(BikeSocketView.open_tickets.remove_all_expired(timedelta(hours=1)))
+    app['ticket_cleaner'] = loop.create_task(remove_expired_tickets(timedelta(hours=1)))
     loop.create_task(app['reservation_sourcer'].run())
     loop.create_task(app['statistics_reporter'].run())
 
@@ -74,10 +110,21 @@ async def stop_background_tasks(app):
         await app['ticket_cleaner']
 
 
+def concurrently(*signals):
+    """Combines a number of independent signals into one that runs them all at the same time."""
+
+    async def signal(app: Application):
+        await asyncio.gather(*(s(app) for s in signals))
+
+    return signal
+
+
 def register_signals(app, init_database=True):
     """Registers all the signals at the appropriate hooks."""
     if init_database:
-        app.on_startup.append(initialize_database)
+        app.on_startup.append(concurrently(initialize_database, fetch_verification_keys))
+    else:
+        app.on_startup.append(fetch_verification_keys)
 
     app.on_startup.append(rebuild_event_states)  # we deliberately rebuild the event states
     app.on_startup.append(start_background_tasks)  # before starting the background tasks
@@ -85,4 +132,7 @@ def register_signals(app, init_database=True):
     app.on_shutdown.append(close_bike_connections)
 
     app.on_cleanup.append(stop_background_tasks)
+    app.on_cleanup.append(write_rental_updates)
     app.on_cleanup.append(close_database_connections)
+    app.on_cleanup.append(close_payment_connections)
+    app.on_cleanup.append(close_token_verifier)
@@ -25,7 +25,8 @@ DELETE requests respond with a 204 content not found.
 .. _`Web Api Design`: https://pages.apigee.com/rs/apigee/images/api-design-ebook-2012-03.pdf
 .. _idempotent: https://www.w3.org/Protocols/rfc2616/rfc2616-sec9.html#sec9.1.2
 """
-from typing import List, Type
+import logging
+from typing import Tuple, Type
 
 import aiohttp_cors
 from aiohttp.abc import Application
@@ -43,9 +44,10 @@ from .reservations import ReservationView, ReservationsView
 from .users import UserView, UsersView, UserIssuesView, UserRentalsView, UserReservationsView, MeView, \
     UserCurrentRentalView, UserCurrentReservationView, UserEndCurrentRentalView, UserPaymentView
 
-views: List[Type[BaseView]] = [
-    BikeView, BikesView, BrokenBikesView, LowBikesView, BikeRentalsView, BikeIssuesView, BikeSocketView,
-    ClosestBikeView,
+views: Tuple[Type[BaseView], ...] = (
+    # the literal bike routes must be registered before those matching any {identifier}
+    BikesView, BrokenBikesView, LowBikesView, BikeSocketView, ClosestBikeView,
+    BikeView, BikeRentalsView, BikeIssuesView,
     IssuesView, IssueView,
     PickupView, PickupsView, PickupBikesView, PickupReservationsView, PickupShortagesView,
     RentalView, RentalsView,
@@ -54,7 +56,7 @@ views: List[Type[BaseView]] = [
     UserPaymentView,
     UserCurrentReservationView, UserEndCurrentRentalView,
     AnnualReportView, MonthlyReportView, DailyReportView, CurrentReportView
-]
+)
 
 
 def register_views(app: Application, base: str):
@@ -65,8 +67,12 @@ def register_views(app: Application, base: str):
     :param base: The base URL.
     """
     cors = aiohttp_cors.setup(app)
+    BaseView.bind_services(app)
 
     for view in views:
-        logger.info("Registered %s at %s", view.__name__, base + view.url)
         view.register_route(app, base)
         view.enable_cors(cors)
+
+    logger.info("Registered %s views at %s", len(views), base)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Registered views: %s", ", ".join(f"{view.__name__} at {view.url}" for view in views))
@@ -18,6 +18,8 @@ from server.service.manager.bike_connection_manager import BikeConnectionManager
 from server.service.manager.rental_manager import RentalManager
 from server.service.manager.reservation_manager import ReservationManager
 from server.service.payment import PaymentManager
+from server.service.pickup_cache import PickupPointCache
+from server.service.ticket_store import TicketStore
 
 
 class ViewConfigurationError(Exception):
@@ -41,6 +43,8 @@ class BaseView(View, CorsViewMixin):
     reservation_sourcer: ReservationSourcer
     statistics_reporter: StatisticsReporter
     payment_manager: PaymentManager
+    ticket_store: TicketStore
+    pickup_cache: PickupPointCache
 
     cors_config = {
         "*": ResourceOptions(
@@ -69,17 +73,26 @@ class BaseView(View, CorsViewMixin):
             kwargs["name"] = name
 
         cls.route = app.router.add_view(url, cls, **kwargs)
-        cls.rental_manager = app["rental_manager"]
-        cls.bike_connection_manager = app["bike_location_manager"]
-        cls.reservation_manager = app["reservation_manager"]
-        cls.reservation_sourcer = app["reservation_sourcer"]
-        cls.statistics_reporter = app["statistics_reporter"]
-        cls.payment_manager = app["payment_manager"]
+
+    @staticmethod
+    def bind_services(app: Application):
+        """
+        Makes the app's services available to all views. They are
+        set on the base class, so this only needs to happen once.
+        """
+        BaseView.rental_manager = app["rental_manager"]
+        BaseView.bike_connection_manager = app["bike_location_manager"]
+        BaseView.reservation_manager = app["reservation_manager"]
+        BaseView.reservation_sourcer = app["reservation_sourcer"]
+        BaseView.statistics_reporter = app["statistics_reporter"]
+        BaseView.payment_manager = app["payment_manager"]
+        BaseView.ticket_store = app["ticket_store"]
+        BaseView.pickup_cache = app["pickup_cache"]
 
     @classmethod
     def enable_cors(cls, cors: CorsConfig):
         """Enables CORS on the view."""
         try:
-            cors.add(cls.route, webview=True)
+            cors.add(cls.route)
         except AttributeError as error:
             raise ViewConfigurationError("No route assigned. Please register the route first.") from error
@@ -4,6 +4,7 @@ Bike Related Views
 
 Handles all the bike CRUD
 """
+import asyncio
 from functools import partial
 from json import JSONDecodeError
 from typing import List
@@ -29,18 +30,19 @@ from server.serializer.fields import Many
 from server.serializer.json_rpc import JsonRPCRequest, JsonRPCResponse
 from server.serializer.misc import MasterKeySchema, BikeRegisterSchema, BikeModifySchema
 from server.serializer.models import CurrentRentalSchema, IssueSchema, BikeSchema, RentalSchema
-from server.service import TicketStore, ActiveRentalError
+from server.service import ActiveRentalError
 from server.service.access.bikes import get_bikes, get_bike, register_bike, BadKeyError, delete_bike, \
     set_bike_in_circulation
 from server.service.access.issues import get_issues, get_broken_bikes, open_issue
 from server.service.access.rentals import get_rentals_for_bike
 from server.service.access.reservations import current_reservations
-from server.service.access.users import get_user
+from server.service.access.users import get_token_user
 from server.service.manager.reservation_manager import ReservationError, CollectionError
 from server.views.base import BaseView
 from server.views.decorators import match_getter, GetFrom, Optional
 
-BIKE_IDENTIFIER_REGEX = "(?!connect|broken|low|closest)[^{}/]+"
+rpc_request_schema = JsonRPCRequest()
+rpc_response_schema = JsonRPCResponse()
 
 
 class BikesView(BaseView):
@@ -48,7 +50,8 @@ class BikesView(BaseView):
     Gets the bikes, or adds a new bike.
     """
     url = "/bikes"
-    with_user = match_getter(get_user, Optional("user"), firebase_id=Optional(GetFrom.AUTH_HEADER))
+    with_user = match_getter(get_token_user, Optional("user"),
+                             firebase_id=Optional(GetFrom.AUTH_HEADER), request=GetFrom.REQUEST)
 
     @with_user
     @docs(summary="Get All Bikes")
@@ -56,15 +59,26 @@ class BikesView(BaseView):
         bikes=Many(BikeSchema(exclude=("public_key",)))))
     async def get(self, user):
         """Gets all the bikes from the system."""
-        bikes = [bike.serialize(
+        available_only = self.request.query.get("available") == "true"
+        bikes = await get_bikes()
+
+        if available_only:
+            # skip serializing the bikes that cannot be available
+            bikes = [
+                bike for bike in bikes
+                if self.bike_connection_manager.is_connected(bike) and not self.rental_manager.is_in_use(bike)
+            ]
+
+        bikes = Bike.serialize_many(
+            bikes,
             self.bike_connection_manager,
             self.rental_manager,
             self.reservation_manager,
             include_location=user is not None and user.type is not UserType.USER
-        ) for bike in await get_bikes()]
+        )
 
-        if self.request.query.get("available") == "true":
-            bikes = (bike for bike in bikes if bike["status"] == "available")
+        if available_only:
+            bikes = [bike for bike in bikes if bike["status"] == "available"]
 
         return {
             "status": JSendStatus.SUCCESS,
@@ -93,11 +107,14 @@ class BikesView(BaseView):
                 },
             }
         else:
+            # only the identifier and availability are returned, so skip the full serialization
+            connected = self.bike_connection_manager.is_connected(bike)
             return "registered", {
                 "status": JSendStatus.SUCCESS,
-                "data": {"bike": bike.serialize(
-                    self.bike_connection_manager, self.rental_manager, self.reservation_manager
-                )}
+                "data": {"bike": {
+                    "identifier": bike.identifier,
+                    "available": connected and self.rental_manager.is_available(bike, self.reservation_manager)
+                }}
             }
 
 
@@ -107,7 +124,7 @@ class BrokenBikesView(BaseView):
     """
     url = "/bikes/broken"
     with_bikes = match_getter(get_broken_bikes, "broken_bikes")
-    with_admin = match_getter(get_user, "user", firebase_id=GetFrom.AUTH_HEADER)
+    with_admin = match_getter(get_token_user, "user", firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_admin
     @with_bikes
@@ -120,12 +137,13 @@ class BrokenBikesView(BaseView):
         serviced, and so their status is shown here for use by the operators. These
         bikes can be loaded into a path-finding algorithm and serviced as needed.
         """
+        reserved = self.reservation_manager.reserved_bikes(bike for bike, issues in broken_bikes)
         return {
             "status": JSendStatus.SUCCESS,
             "data": {
                 "bikes": [
                     bike.serialize(self.bike_connection_manager, self.rental_manager, self.reservation_manager,
-                                   issues=issues)
+                                   issues=issues, reserved=bike.id in reserved)
                     for bike, issues in broken_bikes
                 ]
             }
@@ -149,13 +167,16 @@ class LowBikesView(BaseView):
         then your next 5 rides will be 92% off, then 45% off, etc.
         """
         low_battery_bikes = await self.bike_connection_manager.low_battery(30)
+        reserved = self.reservation_manager.reserved_bikes(low_battery_bikes)
         serialized_bikes = [
-            bike.serialize(self.bike_connection_manager, self.rental_manager, self.reservation_manager)
+            bike.serialize(self.bike_connection_manager, self.rental_manager, self.reservation_manager,
+                           reserved=False)
             for bike in low_battery_bikes
+            if bike.id not in reserved
+            and self.bike_connection_manager.is_connected(bike)
+            and not self.rental_manager.is_in_use(bike)
         ]
 
-        serialized_bikes = [bike for bike in serialized_bikes if bike["available"]]
-
         return {
             "status": JSendStatus.SUCCESS,
             "data": {"bikes": serialized_bikes}
@@ -166,10 +187,11 @@ class BikeView(BaseView):
     """
     Gets or updates a single bike.
     """
-    url = f"/bikes/{{identifier:{BIKE_IDENTIFIER_REGEX}}}"
+    url = "/bikes/{identifier}"
     name = "bike"
     with_bike = match_getter(get_bike, 'bike', identifier=('identifier', str))
-    with_user = match_getter(get_user, Optional('user'), firebase_id=Optional(GetFrom.AUTH_HEADER))
+    with_user = match_getter(get_token_user, Optional('user'),
+                             firebase_id=Optional(GetFrom.AUTH_HEADER), request=GetFrom.REQUEST)
     with_rental = match_getter(get_rentals_for_bike)
 
     @with_bike
@@ -269,9 +291,9 @@ class BikeRentalsView(BaseView):
     """
     Gets the rentals for a single bike.
     """
-    url = f"/bikes/{{identifier:{BIKE_IDENTIFIER_REGEX}}}/rentals"
+    url = "/bikes/{identifier}/rentals"
     with_bike = match_getter(get_bike, 'bike', identifier=('identifier', str))
-    with_user = match_getter(get_user, 'user', firebase_id=GetFrom.AUTH_HEADER)
+    with_user = match_getter(get_token_user, 'user', firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_bike
     @with_user
@@ -279,13 +301,14 @@ class BikeRentalsView(BaseView):
     @requires(UserIsAdmin())
     @returns(JSendSchema.of(rentals=Many(RentalSchema())))
     async def get(self, bike: Bike, user):
+        rentals = await asyncio.gather(*(
+            rental.serialize(self.rental_manager, self.bike_connection_manager, self.reservation_manager,
+                             self.request.app.router)
+            for rental in await get_rentals_for_bike(bike=bike)
+        ))
         return {
             "status": JSendStatus.SUCCESS,
-            "data": {"rentals": [
-                await rental.serialize(self.rental_manager, self.bike_connection_manager, self.reservation_manager,
-                                       self.request.app.router)
-                for rental in await get_rentals_for_bike(bike=bike)
-            ]}
+            "data": {"rentals": rentals}
         }
 
     @with_bike
@@ -354,10 +377,10 @@ class BikeRentalsView(BaseView):
 
 
 class BikeIssuesView(BaseView):
-    url = f"/bikes/{{identifier:{BIKE_IDENTIFIER_REGEX}}}/issues"
+    url = "/bikes/{identifier}/issues"
     with_issues = match_getter(partial(get_issues, is_active=True), 'issues', bike=('identifier', str))
     with_bike = match_getter(get_bike, 'bike', identifier=('identifier', str))
-    with_user = match_getter(get_user, "user", firebase_id=GetFrom.AUTH_HEADER)
+    with_user = match_getter(get_token_user, "user", firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_issues
     @with_user
@@ -417,9 +440,6 @@ class BikeSocketView(BaseView):
 
     url = "/bikes/connect"
 
-    open_tickets = TicketStore()
-    """Maps a public key to their currently issued ticket."""
-
     @docs(summary="Connect Bike Socket")
     async def get(self):
         """
@@ -431,11 +451,18 @@ class BikeSocketView(BaseView):
         await socket.prepare(self.request)
         remote = self.request.remote
 
-        public_key = await socket.receive_bytes(timeout=0.5)
-        signature = await socket.receive_bytes(timeout=0.5)
+        try:
+            public_key = await socket.receive_bytes(timeout=0.5)
+            signature = await socket.receive_bytes(timeout=0.5)
+        except (asyncio.TimeoutError, TypeError):
+            # the client was too slow, or did not send bytes
+            if not socket.closed:
+                await socket.send_str("fail:bad_handshake")
+                await socket.close()
+            return socket
 
         try:
-            ticket = self.open_tickets.pop_ticket(remote, public_key)
+            ticket = self.ticket_store.pop_ticket(remote, public_key)
         except KeyError:
             await socket.send_str("fail:no_ticket")
             return socket
@@ -466,19 +493,19 @@ class BikeSocketView(BaseView):
                     continue
                 else:
                     if "method" in data:
-                        valid_data = JsonRPCRequest().load(data)
+                        valid_data = rpc_request_schema.load(data)
                         if "id" not in valid_data and valid_data["method"] == "location_update":
                             point = Point(valid_data["params"]["long"], valid_data["params"]["lat"])
                             await self.bike_connection_manager.update_location(ticket.bike.id, point)
                             self.bike_connection_manager.update_battery(ticket.bike.id, valid_data["params"]["bat"])
                     else:
-                        valid_data = JsonRPCResponse().load(data)
+                        valid_data = rpc_response_schema.load(data)
                         await self.bike_connection_manager.resolve_command(
                             ticket.bike.id, valid_data["id"], valid_data["result"])
         finally:
             logger.info("Bike %s disconnected", ticket.bike.id)
             await socket.close()
-            del self.bike_connection_manager._bike_connections[ticket.bike.id]
+            self.bike_connection_manager.remove_connection(ticket.bike, socket)
             del ticket
             del socket
 
@@ -495,5 +522,5 @@ class BikeSocketView(BaseView):
         if bike is None:
             raise web.HTTPUnauthorized(reason="Identity not recognized.")
 
-        challenge = self.open_tickets.add_ticket(self.request.remote, bike)
+        challenge = self.ticket_store.add_ticket(self.request.remote, bike)
         return web.Response(body=challenge)
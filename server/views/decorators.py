@@ -16,6 +16,7 @@ from server.serializer import JSendStatus, JSendSchema
 
 
 converter = OpenAPIConverter("3.0.2", resolver, None)
+response_schema = JSendSchema()
 
 
 class Optional:
@@ -27,6 +28,7 @@ class Optional:
 
 class GetFrom(Enum):
     AUTH_HEADER = "Authorization"
+    REQUEST = "request"
 
 
 def flatten(error):
@@ -64,15 +66,21 @@ def resolve_match_map(request: Request, match_map) -> Dict[str, Any]:
                 errors.append(ValueError(
                     f'Could not convert url parameter "{param}" to expected type {value[1].__name__}.'))
         elif value == GetFrom.AUTH_HEADER:
-            if "Authorization" not in request.headers:
+            auth_header = request.headers.get("Authorization")
+            if auth_header is None:
                 if not is_optional:
                     errors.append(ValueError("Missing Authorization header."))
                 continue
-            elif not request.headers["Authorization"].startswith("Bearer "):
+            elif not auth_header.startswith("Bearer "):
                 errors.append(ValueError("Malformed Authorization header (expected Bearer $TOKEN)."))
                 continue
-            user_id = request.app["token_verifier"].verify_token(request.headers["Authorization"][7:])
+            if "token" in request:
+                user_id = request["token"]  # already verified by the middleware
+            else:
+                user_id = request.app["token_verifier"].verify_token(auth_header[7:])
             resolved_matches[key] = user_id
+        elif value == GetFrom.REQUEST:
+            resolved_matches[key] = request
         else:
             raise TypeError(f"match_getter incorrectly configured (doesn't support {type(value)})")
 
@@ -113,7 +121,7 @@ def match_getter(getter_function, *injection_parameters: Union[str, Optional],
                         "errors": flatten(error)
                     }
                 }
-                raise web.HTTPBadRequest(text=JSendSchema().dumps(response), content_type='application/json')
+                raise web.HTTPBadRequest(text=response_schema.dumps(response), content_type='application/json')
             item = getter_function(**params)
             if isawaitable(item):
                 item = await item
@@ -145,7 +153,7 @@ def match_getter(getter_function, *injection_parameters: Union[str, Optional],
                         "params": params
                     }
                 }
-                raise web.HTTPNotFound(text=JSendSchema().dumps(response), content_type='application/json')
+                raise web.HTTPNotFound(text=response_schema.dumps(response), content_type='application/json')
 
             return await original_function(self, **kwargs, **injected_kwargs)
 
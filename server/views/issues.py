@@ -18,7 +18,7 @@ from server.serializer.fields import Many
 from server.serializer.misc import IssueUpdateSchema
 from server.serializer.models import IssueSchema
 from server.service.access.issues import get_issues, get_issue, update_issue
-from server.service.access.users import get_user
+from server.service.access.users import get_token_user
 from server.views.base import BaseView
 from server.views.decorators import match_getter, GetFrom
 
@@ -29,7 +29,7 @@ class IssuesView(BaseView):
     """
     url = "/issues"
     with_issues = match_getter(partial(get_issues, is_active=True), "issues")
-    with_admin = match_getter(get_user, "user", firebase_id=GetFrom.AUTH_HEADER)
+    with_admin = match_getter(get_token_user, "user", firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_admin
     @with_issues
@@ -16,9 +16,8 @@ from server.serializer import JSendSchema, JSendStatus
 from server.serializer.decorators import returns, expects
 from server.serializer.fields import Many
 from server.serializer.models import PickupPointSchema, BikeSchema, ReservationSchema, CreateReservationSchema
-from server.service.access.pickup_points import get_pickup_points, get_pickup_point
 from server.service.access.reservations import get_reservations
-from server.service.access.users import get_user
+from server.service.access.users import get_token_user
 from server.service.manager.reservation_manager import ReservationError
 from server.views.base import BaseView
 from server.views.decorators import match_getter, GetFrom, Optional
@@ -26,19 +25,25 @@ from server.views.decorators import match_getter, GetFrom, Optional
 PICKUP_IDENTIFIER_REGEX = "(?!shortages)[^{}/]+"
 
 
+def get_cached_pickup_point(request, pickup_id: int):
+    """Gets a pickup point through the app's pickup point cache."""
+    return request.app["pickup_cache"].get_pickup_point(pickup_id)
+
+
 class PickupsView(BaseView):
     """
     Gets or adds to the list of all pick-up points.
     """
     url = "/pickups"
     name = "pickups"
-    with_optional_user = match_getter(get_user, Optional("user"), firebase_id=Optional(GetFrom.AUTH_HEADER))
+    with_optional_user = match_getter(get_token_user, Optional("user"),
+                                      firebase_id=Optional(GetFrom.AUTH_HEADER), request=GetFrom.REQUEST)
 
     @docs(summary="Get All Pickup Points")
     @with_optional_user
     @returns(JSendSchema.of(pickups=Many(PickupPointSchema())))
     async def get(self, user: User):
-        pickups = {pickup: (None, None) for pickup in await get_pickup_points()}
+        pickups = {pickup: (None, None) for pickup in await self.pickup_cache.get_pickup_points()}
 
         if user is not None and user.is_admin:
             pickups.update(self.reservation_sourcer.shortages())
@@ -62,8 +67,8 @@ class PickupView(BaseView):
     """
     url = f"/pickups/{{id:{PICKUP_IDENTIFIER_REGEX}}}"
     name = "pickup"
-    with_pickup = match_getter(get_pickup_point, 'pickup', pickup_id='id')
-    with_user = match_getter(get_user, "user", firebase_id=GetFrom.AUTH_HEADER)
+    with_pickup = match_getter(get_cached_pickup_point, 'pickup', pickup_id='id', request=GetFrom.REQUEST)
+    with_user = match_getter(get_token_user, "user", firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_pickup
     @docs(summary="Get A Pickup Point")
@@ -81,7 +86,7 @@ class PickupView(BaseView):
     @docs(summary="Delete A Pickup Point")
     @requires(UserIsAdmin())
     async def delete(self, pickup: PickupPoint, user: User):
-        await pickup.delete()
+        await self.pickup_cache.delete_pickup_point(pickup)
         raise web.HTTPNoContent
 
 
@@ -90,7 +95,7 @@ class PickupBikesView(BaseView):
     Gets list of bikes currently at a pickup point.
     """
     url = f"/pickups/{{id:{PICKUP_IDENTIFIER_REGEX}}}/bikes"
-    with_pickup = match_getter(get_pickup_point, 'pickup', pickup_id='id')
+    with_pickup = match_getter(get_cached_pickup_point, 'pickup', pickup_id='id', request=GetFrom.REQUEST)
 
     @with_pickup
     @docs(summary="Get All Bikes In Pickup Point")
@@ -110,8 +115,8 @@ class PickupReservationsView(BaseView):
     Gets or adds to a pickup point's list of reservations.
     """
     url = f"/pickups/{{id:{PICKUP_IDENTIFIER_REGEX}}}/reservations"
-    with_user = match_getter(get_user, "user", firebase_id=GetFrom.AUTH_HEADER)
-    with_pickup = match_getter(get_pickup_point, "pickup", pickup_id="id")
+    with_user = match_getter(get_token_user, "user", firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
+    with_pickup = match_getter(get_cached_pickup_point, "pickup", pickup_id="id", request=GetFrom.REQUEST)
 
     @with_user
     @docs(summary="Get All Reservations For Pickup Point")
@@ -162,7 +167,7 @@ class PickupShortagesView(BaseView):
     """
 
     url = "/pickups/shortages"
-    with_user = match_getter(get_user, "user", firebase_id=GetFrom.AUTH_HEADER)
+    with_user = match_getter(get_token_user, "user", firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_user
     @requires(UserIsAdmin())
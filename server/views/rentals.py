@@ -6,6 +6,8 @@ Handles all the rentals CRUD.
 
 To start a rental, go through the bike.
 """
+import asyncio
+
 from aiohttp_apispec import docs
 
 from server.models import Rental
@@ -16,7 +18,7 @@ from server.serializer.decorators import returns
 from server.serializer.fields import Many
 from server.serializer.models import RentalSchema
 from server.service.access.rentals import get_rental_with_distance, get_rentals
-from server.service.access.users import get_user
+from server.service.access.users import get_token_user
 from server.views.base import BaseView
 from server.views.decorators import match_getter, GetFrom, Optional
 
@@ -27,7 +29,7 @@ class RentalsView(BaseView):
     """
     url = "/rentals"
     name = "rentals"
-    with_user = match_getter(get_user, 'user', firebase_id=GetFrom.AUTH_HEADER)
+    with_user = match_getter(get_token_user, 'user', firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_user
     @docs(summary="Get All Rentals")
@@ -39,13 +41,14 @@ class RentalsView(BaseView):
         )))
     ))
     async def get(self, user):
+        rentals = await asyncio.gather(*(
+            rental.serialize(self.rental_manager, self.bike_connection_manager, self.reservation_manager,
+                             self.request.app.router)
+            for rental in await get_rentals()
+        ))
         return {
             "status": JSendStatus.SUCCESS,
-            "data": {"rentals": [
-                await rental.serialize(self.rental_manager, self.bike_connection_manager, self.reservation_manager,
-                                       self.request.app.router)
-                for rental in await get_rentals()
-            ]}
+            "data": {"rentals": rentals}
         }
 
 
@@ -56,7 +59,7 @@ class RentalView(BaseView):
     url = "/rentals/{id}"
     name = "rental"
     with_rental = match_getter(get_rental_with_distance, 'rental', Optional('distance'), rental='id')
-    with_user = match_getter(get_user, 'user', firebase_id=GetFrom.AUTH_HEADER)
+    with_user = match_getter(get_token_user, 'user', firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_rental
     @with_user
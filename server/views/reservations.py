@@ -18,7 +18,7 @@ from server.serializer import JSendStatus, returns, JSendSchema
 from server.serializer.fields import Many
 from server.serializer.models import ReservationSchema
 from server.service.access.reservations import get_reservation, get_reservations
-from server.service.access.users import get_user
+from server.service.access.users import get_token_user
 from server.views.base import BaseView
 from server.views.decorators import match_getter, GetFrom
 
@@ -29,7 +29,7 @@ class ReservationsView(BaseView):
     """
     url = "/reservations"
 
-    with_user = match_getter(get_user, 'user', firebase_id=GetFrom.AUTH_HEADER)
+    with_user = match_getter(get_token_user, 'user', firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_user
     @docs(summary="Get All Reservations")
@@ -52,7 +52,7 @@ class ReservationView(BaseView):
     url = "/reservations/{id}"
     name = "reservation"
     with_reservation = match_getter(get_reservation, 'reservation', rid="id")
-    with_user = match_getter(get_user, 'user', firebase_id=GetFrom.AUTH_HEADER)
+    with_user = match_getter(get_token_user, 'user', firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_user
     @with_reservation
@@ -4,6 +4,7 @@ User Related Views
 
 Handles all the user CRUD
 """
+import asyncio
 from http import HTTPStatus
 from typing import List
 
@@ -13,7 +14,7 @@ from marshmallow.fields import String, Url
 
 from server.models import User, Rental, Reservation
 from server.permissions import UserMatchesToken, UserIsAdmin, requires, ValidToken
-from server.serializer import JSendSchema, JSendStatus
+from server.serializer import JSendSchema, JSendStatus, json_response
 from server.serializer.decorators import expects, returns
 from server.serializer.fields import Many
 from server.serializer.misc import PaymentSourceSchema
@@ -23,12 +24,15 @@ from server.service.access.bikes import get_bike
 from server.service.access.issues import get_issues, open_issue
 from server.service.access.rentals import get_rentals
 from server.service.access.reservations import current_reservations, get_user_reservations
-from server.service.access.users import get_users, get_user, delete_user, create_user, UserExistsError, update_user
+from server.service.access.users import get_users, get_user, delete_user, create_user, UserExistsError, update_user, \
+    get_token_user
 from server.views.base import BaseView
 from server.views.decorators import match_getter, GetFrom
 
 USER_IDENTIFIER_REGEX = "(?!me)[^{}/]+"
 
+response_schema = JSendSchema()
+
 
 class UsersView(BaseView):
     """
@@ -36,7 +40,7 @@ class UsersView(BaseView):
     """
     url = "/users"
     name = "users"
-    with_user = match_getter(get_user, 'user', firebase_id=GetFrom.AUTH_HEADER)
+    with_user = match_getter(get_token_user, 'user', firebase_id=GetFrom.AUTH_HEADER, request=GetFrom.REQUEST)
 
     @with_user
     @docs(summary="Get All Users")
@@ -180,10 +184,14 @@ class UserRentalsView(BaseView):
     @requires(UserMatchesToken() | UserIsAdmin())
     @returns(JSendSchema.of(rentals=Many(RentalSchema())))
     async def get(self, user, rentals: List[Rental]):
+        serialized_rentals = await asyncio.gather(*(
+            rental.serialize(self.rental_manager, self.bike_connection_manager, self.reservation_manager,
+                             self.request.app.router)
+            for rental in rentals
+        ))
         return {
             "status": JSendStatus.SUCCESS,
-            "data": {
-                "rentals": [await rental.serialize(self.rental_manager, self.request.app.router) for rental in rentals]}
+            "data": {"rentals": serialized_rentals}
         }
 
 
@@ -403,12 +411,11 @@ class MeView(BaseView):
         """
         Accepts all types of request, does some checking against the user, and forwards them on to the appropriate user.
         """
-        user = await get_user(firebase_id=self.request["token"])
+        user = await get_token_user(self.request)
 
         if user is None:
-            response_schema = JSendSchema()
             create_user_url = str(self.request.app.router['users'].url_for())
-            return web.json_response(response_schema.dump({
+            return json_response(response_schema.dump({
                 "status": JSendStatus.FAIL,
                 "data": {
                     "message": "User does not exist. Please use your jwt to create a user and try again.",
@@ -17,7 +17,7 @@ from server.middleware import validate_token_middleware
 from server.models import Bike, User, Rental
 from server.models.pickup_point import PickupPoint
 from server.models.user import UserType
-from server.service import TicketStore
+from server.service import TicketStore, PickupPointCache
 from server.service.background.reservation_sourcer import ReservationSourcer
 from server.service.background.stats_reporter import StatisticsReporter
 from server.service.manager.bike_connection_manager import BikeConnectionManager
@@ -129,7 +129,8 @@ async def database(_database, loop, database_url):
 @pytest.fixture
 async def client(
     aiohttp_client, database,
-    rental_manager, payment_manager, bike_connection_manager, reservation_manager, reservation_sourcer, statistics_reporter
+    rental_manager, payment_manager, bike_connection_manager, reservation_manager, reservation_sourcer, statistics_reporter,
+    ticket_store, pickup_cache
 ) -> TestClient:
     asyncio.get_event_loop().set_debug(True)
     app = web.Application(middlewares=[validate_token_middleware])
@@ -140,6 +141,8 @@ async def client(
     app['reservation_manager'] = reservation_manager
     app['reservation_sourcer'] = reservation_sourcer
     app['statistics_reporter'] = statistics_reporter
+    app['ticket_store'] = ticket_store
+    app['pickup_cache'] = pickup_cache
     app['token_verifier'] = DummyVerifier()
 
     register_signals(app, init_database=False)  # we get the database from a fixture
@@ -153,6 +156,11 @@ def ticket_store():
     return TicketStore()
 
 
+@pytest.fixture
+def pickup_cache(database):
+    return PickupPointCache()
+
+
 @pytest.fixture
 def bike_connection_manager(database):
     return BikeConnectionManager()
@@ -164,8 +172,10 @@ def payment_manager():
 
 
 @pytest.fixture
-def rental_manager(database, payment_manager):
-    return RentalManager(payment_manager)
+async def rental_manager(database, payment_manager):
+    manager = RentalManager(payment_manager)
+    yield manager
+    await manager.write_pending_updates()
 
 
 @pytest.fixture
@@ -195,6 +205,7 @@ async def random_rental(rental_manager, random_bike, random_user, bike_connectio
     """Creates a random rental in the database."""
     await bike_connection_manager.update_location(random_bike, Point(0, 0))
     rental, location = await rental_manager.create(random_user, random_bike)
+    await rental_manager.write_pending_updates()
     rental.bike = random_bike
     return rental
 
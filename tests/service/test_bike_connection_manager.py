@@ -60,6 +60,23 @@ class TestBikeConnectionManager:
 
         assert mocked_close.call_count == 1
 
+    async def test_remove_connection(self, mocker, bike_connection_manager, random_bike):
+        """Assert that removing a replaced socket keeps the new connection."""
+
+        mocked_close = mocker.patch('aiohttp.web_ws.WebSocketResponse.close')
+        mocked_close.side_effect = self.conn_generator()
+
+        r0, r1 = WebSocketResponse(), WebSocketResponse()
+
+        await bike_connection_manager.add_connection(random_bike, r0)
+        await bike_connection_manager.add_connection(random_bike, r1)
+
+        bike_connection_manager.remove_connection(random_bike, r0)
+        assert bike_connection_manager._bike_connections[random_bike.id] is r1
+
+        bike_connection_manager.remove_connection(random_bike, r1)
+        assert random_bike.id not in bike_connection_manager._bike_connections
+
     async def test_add_connection_closed(self, mocker, bike_connection_manager, random_bike):
         """Assert that adding a closed connection fails."""
 
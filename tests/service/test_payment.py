@@ -0,0 +1,134 @@
+import aiohttp
+import pytest
+
+from server.service.payment import PaymentManager, PaymentError, STRIPE_API_URL
+
+
+class FakeResponse:
+    """Stands in for a stripe response."""
+
+    def __init__(self, status, body=None, error=None):
+        self.status = status
+        self._body = body
+        self._error = error
+
+    async def json(self):
+        if self._error is not None:
+            raise self._error
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeSession:
+    """Records the requests made to stripe, answering each with the same response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return self.response
+
+
+@pytest.fixture
+def stripe_session(mocker):
+    def respond(status, body=None, error=None):
+        session = FakeSession(FakeResponse(status, body, error))
+        mocker.patch("server.service.payment.get_session", return_value=session)
+        return session
+
+    return respond
+
+
+@pytest.fixture
+def stripe_manager():
+    return PaymentManager("sk_test")
+
+
+async def test_create_customer(stripe_session, stripe_manager, random_user):
+    session = stripe_session(200, {"id": "cus_1"})
+    await stripe_manager.create_customer(random_user, "tok_1")
+
+    method, url, kwargs = session.requests[0]
+    assert (method, url) == ("POST", STRIPE_API_URL + "/customers")
+    assert kwargs["data"]["source"] == "tok_1"
+    assert kwargs["headers"] == {"Authorization": "Bearer sk_test"}
+    assert random_user.stripe_id == "cus_1"
+
+
+async def test_update_customer(stripe_session, stripe_manager, random_user):
+    random_user.stripe_id = "cus_1"
+    session = stripe_session(200, {"id": "cus_1"})
+    await stripe_manager.update_customer(random_user, "tok_2")
+
+    method, url, kwargs = session.requests[0]
+    assert (method, url) == ("POST", STRIPE_API_URL + "/customers/cus_1")
+    assert kwargs["data"] == {"source": "tok_2"}
+
+
+async def test_delete_customer(stripe_session, stripe_manager, random_user):
+    random_user.stripe_id = "cus_1"
+    session = stripe_session(200, {"id": "cus_1", "deleted": True})
+    await stripe_manager.delete_customer(random_user)
+
+    method, url, kwargs = session.requests[0]
+    assert (method, url) == ("DELETE", STRIPE_API_URL + "/customers/cus_1")
+    assert kwargs["data"] is None
+    assert random_user.stripe_id is None
+
+
+async def test_charge_customer(stripe_session, stripe_manager, random_user, random_rental):
+    random_user.stripe_id = "cus_1"
+    session = stripe_session(200, {"status": "succeeded", "receipt_url": "https://pay.stripe.com/receipts/1"})
+
+    paid, receipt = await stripe_manager.charge_customer(random_user, random_rental, 1.5)
+
+    method, url, kwargs = session.requests[0]
+    assert (method, url) == ("POST", STRIPE_API_URL + "/charges")
+    assert kwargs["data"]["customer"] == "cus_1"
+    assert "1.50 miles" in kwargs["data"]["description"]
+    assert paid
+    assert receipt == "https://pay.stripe.com/receipts/1"
+
+
+async def test_create_customer_rejected(stripe_session, stripe_manager, random_user):
+    """Assert that a stripe error is raised as a PaymentError with stripe's message."""
+    stripe_id = random_user.stripe_id
+    stripe_session(402, {"error": {"message": "Your card was declined."}})
+
+    with pytest.raises(PaymentError) as error:
+        await stripe_manager.create_customer(random_user, "tok_1")
+
+    assert error.value.message == "Your card was declined."
+    assert random_user.stripe_id == stripe_id
+
+
+async def test_charge_customer_rejected(stripe_session, stripe_manager, random_user, random_rental):
+    random_user.stripe_id = "cus_1"
+    stripe_session(402, {"error": {"message": "Your card has insufficient funds."}})
+
+    with pytest.raises(PaymentError) as error:
+        await stripe_manager.charge_customer(random_user, random_rental)
+
+    assert error.value.message == "Your card has insufficient funds."
+
+
+@pytest.mark.parametrize("error", [
+    aiohttp.ContentTypeError(None, ()),
+    ValueError("Expecting value"),
+])
+async def test_request_not_json(stripe_session, stripe_manager, random_user, error):
+    """Assert that a response that isn't JSON, such as a proxy error page, is raised as a PaymentError."""
+    random_user.stripe_id = "cus_1"
+    stripe_session(502, error=error)
+
+    with pytest.raises(PaymentError):
+        await stripe_manager.delete_customer(random_user)
+
+    assert random_user.stripe_id == "cus_1"
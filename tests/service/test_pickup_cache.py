@@ -0,0 +1,26 @@
+from server.models import PickupPoint
+
+
+async def test_get_pickups(pickup_cache, random_pickup_point):
+    assert random_pickup_point in await pickup_cache.get_pickup_points()
+
+
+async def test_get_pickups_cached(pickup_cache, random_pickup_point):
+    """Assert that the pickup points are served from memory until they go stale."""
+    await pickup_cache.get_pickup_points()
+    await PickupPoint.create(name="new", area=random_pickup_point.area)
+    assert len(await pickup_cache.get_pickup_points()) == 1
+
+
+async def test_get_pickup_added_after_cache(pickup_cache, random_pickup_point):
+    """Assert that a pickup point created after the cache was filled can still be fetched."""
+    await pickup_cache.get_pickup_points()
+    pickup = await PickupPoint.create(name="new", area=random_pickup_point.area)
+    assert await pickup_cache.get_pickup_point(pickup.id) == pickup
+
+
+async def test_delete_pickup(pickup_cache, random_pickup_point):
+    """Assert that deleting a pickup point drops it from the cache."""
+    await pickup_cache.get_pickup_points()
+    await pickup_cache.delete_pickup_point(random_pickup_point)
+    assert await pickup_cache.get_pickup_points() == []
@@ -1,4 +1,4 @@
-from server.service.access.pickup_points import get_pickup_points, get_pickup_at
+from server.service.access.pickup_points import get_pickup_points, get_pickup_at, get_pickup_point
 
 
 class TestPickups:
@@ -7,6 +7,9 @@ class TestPickups:
         points = await get_pickup_points()
         assert random_pickup_point in points
 
+    async def test_get_pickup(self, random_pickup_point):
+        assert await get_pickup_point(random_pickup_point.id) == random_pickup_point
+
     async def test_get_pickups_by_name(self, random_pickup_point):
         pass
 
@@ -1,10 +1,14 @@
+import asyncio
+from datetime import timedelta
+
 import pytest
 from shapely.geometry import Point
+from tortoise.exceptions import OperationalError
 
 from server.models import Rental, RentalUpdate, User, LocationUpdate
 from server.models.util import RentalUpdateType
 from server.service import InactiveRentalError, ActiveRentalError
-from server.service.manager.rental_manager import RentalManager
+from server.service.manager.rental_manager import RentalManager, RentalEvent, UPDATE_FLUSH_INTERVAL
 
 
 async def test_rebuild_rentals(rental_manager: RentalManager, random_user, random_bike):
@@ -16,10 +20,22 @@ async def test_rebuild_rentals(rental_manager: RentalManager, random_user, rando
     assert rental_manager._active_rentals[random_user.id] == (rental.id, random_bike.id)
 
 
+async def test_rebuild_skips_finished_rentals(rental_manager: RentalManager, random_user, random_bike):
+    """Assert that rentals that have been returned are not rebuilt as active."""
+    rental = await Rental.create(user=random_user, bike=random_bike)
+    await RentalUpdate.create(rental=rental, type=RentalUpdateType.RENT)
+    await RentalUpdate.create(rental=rental, type=RentalUpdateType.RETURN)
+    await rental_manager._rebuild()
+
+    assert random_user.id not in rental_manager._active_rentals
+    assert rental.id not in rental_manager._rentals
+
+
 async def test_create_rental(rental_manager, random_user, random_bike, bike_connection_manager):
     """Assert that creating a rental correctly creates an event."""
     await bike_connection_manager.update_location(random_bike, Point(0, 0))
     await rental_manager.create(random_user, random_bike)
+    await rental_manager.write_pending_updates()
     assert await Rental.all().count() == 1
     assert await RentalUpdate.all().count() == 1
     assert (await RentalUpdate.first()).type == RentalUpdateType.RENT
@@ -36,6 +52,7 @@ async def test_create_rental_existing_rental(rental_manager, random_rental, rand
 async def test_finish_rental(rental_manager, random_rental, random_user):
     """Assert that finishing a rental correctly creates an event and charges the customer."""
     await rental_manager.finish(random_user, extra_cost=2.0)
+    await rental_manager.write_pending_updates()
     rental = await Rental.first().prefetch_related('updates')
     assert rental.price >= 2.0
     assert len(rental.updates) == 2
@@ -55,6 +72,23 @@ async def test_cancel_rental(rental_manager, random_rental):
     assert rental.price is None
 
 
+async def test_cancel_rental_notifies_before_write(rental_manager, random_rental):
+    """Assert that subscribers hear about a cancellation without waiting for its update to be written."""
+    cancelled = []
+
+    def rental_cancelled(user, bike):
+        cancelled.append(bike)
+
+    rental_manager.hub.subscribe(RentalEvent.rental_cancelled, rental_cancelled)
+    rental = await rental_manager.cancel(random_rental.user)
+
+    assert cancelled == [rental.bike]
+    assert rental.updates[-1].type == RentalUpdateType.CANCEL
+
+    await rental_manager.write_pending_updates()
+    assert await RentalUpdate.filter(rental=rental, type=RentalUpdateType.CANCEL).count() == 1
+
+
 async def test_cancel_inactive_rental(rental_manager, random_user):
     """Assert that cancelling an inactive rental raises an exception."""
     with pytest.raises(InactiveRentalError):
@@ -97,3 +131,57 @@ async def test_bike_is_in_use(rental_manager, random_rental, random_bike, random
 async def test_is_renting(rental_manager, random_rental, random_bike, random_user):
     """Assert that you can check if a user is renting a given bike."""
     assert rental_manager.is_renting(random_user.id, random_bike.id)
+
+
+async def test_publish_event_interval(rental_manager, random_rental):
+    """Assert that a lone rental update is added straight away, and written once the flush interval passes."""
+    before = await RentalUpdate.filter(rental=random_rental).count()
+    update = rental_manager._publish_event(random_rental, RentalUpdateType.LOCK)
+    assert random_rental.updates[-1] is update
+
+    await asyncio.sleep(UPDATE_FLUSH_INTERVAL.total_seconds() * 2)
+
+    assert update.id is not None
+    assert await RentalUpdate.filter(rental=random_rental).count() == before + 1
+
+
+async def test_publish_event_size(mocker, rental_manager, random_rental):
+    """Assert that reaching the batch size writes the updates without waiting for the interval."""
+    mocker.patch("server.service.manager.rental_manager.UPDATE_FLUSH_INTERVAL", timedelta(hours=1))
+    mocker.patch("server.service.manager.rental_manager.UPDATE_FLUSH_SIZE", 2)
+    before = await RentalUpdate.filter(rental=random_rental).count()
+
+    rental_manager._publish_event(random_rental, RentalUpdateType.LOCK)
+    rental_manager._publish_event(random_rental, RentalUpdateType.UNLOCK)
+    await asyncio.wait_for(asyncio.shield(rental_manager._flush_task), timeout=1)
+
+    assert await RentalUpdate.filter(rental=random_rental).count() == before + 2
+
+
+async def test_publish_event_error(mocker, rental_manager, random_rental):
+    """Assert that a failed write is logged, and doesn't stop later updates from being written."""
+    before = await RentalUpdate.filter(rental=random_rental).count()
+    logger = mocker.patch("server.service.manager.rental_manager.logger")
+    save = mocker.patch.object(RentalUpdate, "save", side_effect=OperationalError("Database unavailable."))
+
+    rental_manager._publish_event(random_rental, RentalUpdateType.LOCK)
+    await rental_manager.write_pending_updates()
+    assert logger.exception.called
+
+    mocker.stopall()
+    rental_manager._publish_event(random_rental, RentalUpdateType.UNLOCK)
+    await rental_manager.write_pending_updates()
+
+    assert save.call_count == 1
+    assert await RentalUpdate.filter(rental=random_rental).count() == before + 1
+
+
+async def test_write_pending_updates(mocker, rental_manager, random_rental):
+    """Assert that the queued rental updates are written before shutting down."""
+    mocker.patch("server.service.manager.rental_manager.UPDATE_FLUSH_INTERVAL", timedelta(hours=1))
+    before = await RentalUpdate.filter(rental=random_rental).count()
+    rental_manager._publish_event(random_rental, RentalUpdateType.LOCK)
+
+    await asyncio.wait_for(rental_manager.write_pending_updates(), timeout=1)
+
+    assert await RentalUpdate.filter(rental=random_rental).count() == before + 1
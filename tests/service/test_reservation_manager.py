@@ -175,3 +175,30 @@ class TestReservationManager:
 
         assert reservation_manager.is_reserved(first)
         assert reservation_manager.is_reserved(second)
+
+    async def test_reserved_bikes(
+        self, random_bike_factory, reservation_manager, random_pickup_point,
+        bike_connection_manager, random_user_factory
+    ):
+        """Assert that the batched reservation check agrees with checking each bike."""
+        bike_connection_manager.is_connected = lambda x: True
+
+        first = await random_bike_factory(bike_connection_manager)
+        second = await random_bike_factory(bike_connection_manager)
+        first_user = await random_user_factory()
+        second_user = await random_user_factory()
+
+        reservation_manager.pickup_points.add(random_pickup_point)
+        await bike_connection_manager.update_location(first, random_pickup_point.area.centroid)
+        await bike_connection_manager.update_location(second, random_pickup_point.area.centroid)
+
+        assert reservation_manager.reserved_bikes([first, second]) == set()
+
+        await reservation_manager.reserve(
+            first_user, random_pickup_point, datetime.now(timezone.utc) + timedelta(minutes=20)
+        )
+        await reservation_manager.reserve(
+            second_user, random_pickup_point, datetime.now(timezone.utc) + timedelta(minutes=20)
+        )
+
+        assert reservation_manager.reserved_bikes([first, second]) == {first.id, second.id}
@@ -47,3 +47,14 @@ async def test_too_many_tickets(ticket_store, random_bike: Bike):
     ticket_store.add_ticket("127.0.0.1", random_bike)
     with raises(TooManyTicketError):
         ticket_store.add_ticket("127.0.0.1", random_bike)
+
+
+@pytest.mark.asyncio
+async def test_add_ticket_replaces_open_ticket(ticket_store, random_bike: Bike):
+    """Make sure there is only ever a single ticket per remote and bike."""
+    ticket_store.add_ticket("127.0.0.1", random_bike)
+    challenge = ticket_store.add_ticket("127.0.0.1", random_bike)
+
+    assert ticket_store.pop_ticket("127.0.0.1", random_bike.public_key).challenge == challenge
+    with raises(KeyError):
+        ticket_store.pop_ticket("127.0.0.1", random_bike.public_key)
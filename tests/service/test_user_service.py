@@ -1,7 +1,8 @@
 import pytest
 
 from server.models import User
-from server.service.access.users import get_users, get_user, create_user, UserExistsError, delete_user, update_user
+from server.service.access.users import get_users, get_user, create_user, UserExistsError, delete_user, update_user, \
+    get_token_user
 from tests.conftest import fake
 
 
@@ -13,6 +14,21 @@ async def test_get_user(random_user):
     assert random_user == await get_user(firebase_id=random_user.firebase_id, user_id=random_user.id)
 
 
+async def test_get_token_user(random_user):
+    """Assert that the token's user is fetched once and stored on the request."""
+    request = {"token": random_user.firebase_id}
+    user = await get_token_user(request)
+    assert user == random_user
+    assert request["user"] is user
+    assert await get_token_user(request) is user
+
+
+async def test_get_token_user_firebase_id(random_user):
+    """Assert that an explicit firebase id is used when the request has no token, and that no token means no user."""
+    assert await get_token_user({}, random_user.firebase_id) == random_user
+    assert await get_token_user({}) is None
+
+
 async def test_create_user(database):
     user = await create_user(fake.name(), fake.email(), fake.sha1())
     users = await User.all()
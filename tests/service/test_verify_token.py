@@ -1,6 +1,9 @@
+import time
+from datetime import timedelta
+
 import pytest
 
-from server.service.verify_token import DummyVerifier, TokenVerificationError, FirebaseVerifier
+from server.service.verify_token import DummyVerifier, TokenVerificationError, FirebaseVerifier, cache_lifetime
 
 keys = {
     '97fcbca368fe77808830c8100121ec7bde22cf0e': """-----BEGIN CERTIFICATE-----
@@ -76,6 +79,47 @@ class TestFirebaseVerifier:
         except TypeError:
             assert not passes
 
+    async def test_verify_cached(self, loop, firebase_verifier):
+        firebase_verifier._cache["token"] = ("user", time.monotonic() + 5)
+        assert firebase_verifier.verify_token("token") == "user"
+
+    async def test_verify_cache_expired(self, loop, firebase_verifier):
+        firebase_verifier._cache["token"] = ("user", time.monotonic() - 1)
+        with pytest.raises(TokenVerificationError):
+            firebase_verifier.verify_token("token")
+        assert "token" not in firebase_verifier._cache
+
+    @pytest.mark.parametrize(('claims', 'cached'), [
+        ({"user_id": "user"}, False),
+        ({"user_id": "user", "exp": 0}, False),
+        ({"user_id": "user", "exp": time.time() + 3600}, True),
+    ])
+    async def test_verify_caches_unexpired(self, loop, mocker, firebase_verifier, claims, cached):
+        """Assert that only tokens with an expiry in the future are cached."""
+        mocker.patch("jose.jwt.get_unverified_claims", return_value={})
+        mocker.patch("jose.jwt.get_unverified_header", return_value={"kid": next(iter(keys))})
+        mocker.patch("jose.jwt.decode", return_value=claims)
+
+        assert firebase_verifier.verify_token("token") == "user"
+        assert ("token" in firebase_verifier._cache) == cached
+
+
+@pytest.mark.parametrize(('headers', 'lifetime'), [
+    ({"Cache-Control": "public, max-age=19958, must-revalidate, no-transform"}, timedelta(seconds=19958)),
+    ({"Expires": "garbage"}, None),
+    ({}, None),
+])
+def test_cache_lifetime(headers, lifetime):
+    assert cache_lifetime(headers) == lifetime
+
+
+@pytest.mark.parametrize('expires', [
+    "Wed, 21 Oct 2015 07:28:00 GMT",
+    "Wed, 21 Oct 2015 07:28:00 -0000",
+])
+def test_cache_lifetime_expires(expires):
+    assert cache_lifetime({"Expires": expires}) < timedelta(0)
+
 
 class TestDummyVerifier:
 
@@ -1,6 +1,8 @@
+from asyncio import CancelledError
+
 import pytest
 
-from server.events import EventHub, NoSuchEventError, NoSuchListenerError, InvalidHandlerError, EventList
+from server.events import EventHub, AsyncEventHub, NoSuchEventError, NoSuchListenerError, InvalidHandlerError, EventList
 from server.events.decorators import emits
 
 
@@ -131,3 +133,31 @@ class TestRegistry:
         emitter.something_happened += raise_listener
         with pytest.raises(TestException):
             emitter.something_happened("test")
+
+    async def test_trigger_async_event(self):
+        """Assert that a failing async handler does not stop the others from running."""
+        emitter = AsyncEventHub(ExampleEvents)
+        called = []
+
+        async def raise_listener(argument):
+            raise TestException("This runs!")
+
+        async def record_listener(argument):
+            called.append(argument)
+
+        emitter.subscribe(ExampleEvents.something_happened, raise_listener)
+        emitter.subscribe(ExampleEvents.something_happened, record_listener)
+        with pytest.raises(TestException):
+            await emitter.emit(ExampleEvents.something_happened, "test")
+        assert called == ["test"]
+
+    async def test_trigger_async_event_cancelled(self):
+        """Assert that a handler raising a BaseException, such as CancelledError, is not silently dropped."""
+        emitter = AsyncEventHub(ExampleEvents)
+
+        async def cancelled_listener(argument):
+            raise CancelledError()
+
+        emitter.subscribe(ExampleEvents.something_happened, cancelled_listener)
+        with pytest.raises(CancelledError):
+            await emitter.emit(ExampleEvents.something_happened, "test")